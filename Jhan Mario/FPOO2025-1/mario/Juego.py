@@ -1,48 +1,314 @@
-from Poder import Hongo, Planta
-from Personaje import Jugador 
-
-hongo1 = Hongo(1, "Hongo Rojo", "Hongo que hace crecer a Mario", 5, 0, "activo", "Rojo")
-hongo2 = Hongo(2, "Hongo Rojo", "Hongo que hace crecer a Mario", 10, 2, "activo", "Rojo")
-hongo3 = Hongo(3, "Hongo Verde", "Hongo que hace crecer a Mario", 15, 0, "activo", "Verde")
-
-planta1 = Planta(4, "Planta Fuego", "Planta que lanza fuego", 20, 0, "activo")
-mario = Jugador(1, "Mario")
-
-def mostrarTodo():
-    if(hongo1.posicionX == mario.posicionX):
-        mario.recogerPoder(hongo1)
-    print(mario)
-    print(hongo1)
-    print(hongo2)
-    print(hongo3)
-
-
-mario.mover(1, 0)
-mario.mover(1, 0)
-mario.mover(1, 0)
-mario.mover(1, 0)
-mostrarTodo()
-mario.mover(1, 0)
-mostrarTodo()
-
-
-accion = 0
-while accion < 5:
-    print("1. Adelante")
-    print("2. Atras")
-    print("3. Subir")
-    print("4. Bajar")
-    accion = int(input("Ingrese la accion: "))
-    
-    if accion == 1:
-       mario.mover(1, 0)
-       mostrarTodo()
-    elif accion == 2:
-       mario.mover(-1, 0)
-       mostrarTodo()
-    elif accion == 3:
-       mario.mover(0, 1)
-       mostrarTodo()
-    elif accion == 4:
-        mario.mover(0, -1)
-        mostrarTodo()
+import asyncio
+import io
+import logging
+import os
+import random
+import signal
+import stat
+import sys
+import threading
+import time
+from Poder import Hongo, Planta, IndicePoderes, RegistroPoderes, numpy_disponible
+from Personaje import Jugador
+
+# Uso:
+#   python Juego.py [cantidad de poderes]                       menú interactivo
+#   python Juego.py [cantidad] --archivo=acciones.txt           acciones desde un archivo
+#   python Juego.py [cantidad] --puerto=N                       acciones por TCP (nc localhost N);
+#                                                               un 5 o Ctrl+C cierra el servidor y muestra el resumen
+#   python Juego.py [cantidad] < acciones.txt                   acciones por la entrada estándar
+#   --silencioso   sin mensajes por movimiento ni por lote, solo el resumen final
+# Las acciones son un número por línea (1 adelante, 2 atrás, 3 subir, 4 bajar, 5 o más termina).
+
+ANCHO_MUNDO = 30  # los poderes aparecen en 0..ANCHO_MUNDO x 0..ALTO_MUNDO
+ALTO_MUNDO = 5
+UMBRAL_REGISTRO = 100_000  # desde esta cantidad los poderes se guardan en columnas (si hay numpy)
+TAM_BLOQUE = 64 * 1024  # bytes leídos de una vez; cada bloque es un lote de acciones
+
+ACCIONES = {1: (1, 0), 2: (-1, 0), 3: (0, 1), 4: (0, -1)}
+SALIR = 5
+
+registro = logging.getLogger(__name__)
+
+def generarPoderes(cantidad, ancho=ANCHO_MUNDO, alto=ALTO_MUNDO, rng=random):
+    """Poderes al azar (hongos rojos, verdes y plantas), todos activos"""
+    poderes = []
+    for i in range(1, cantidad + 1):
+        x, y = rng.randint(1, ancho), rng.randint(0, alto)
+        clase = rng.choice(("Rojo", "Verde", "Planta"))
+        if clase == "Planta":
+            poderes.append(Planta(i, "Planta Fuego", "Planta que lanza fuego", x, y, "activo"))
+        else:
+            poderes.append(Hongo(i, f"Hongo {clase}", "Hongo que hace crecer a Mario", x, y, "activo", clase))
+    return poderes
+
+def crearPoderes(cantidad):
+    ancho = max(ANCHO_MUNDO, cantidad // 10)  # con muchos poderes el mundo se alarga
+    if cantidad >= UMBRAL_REGISTRO and numpy_disponible():
+        # ✅ Millones de poderes: columnas de NumPy generadas de una vez, sin un objeto por poder
+        indice = RegistroPoderes(cantidad)
+        indice.generar(cantidad, ancho, ALTO_MUNDO)
+        return indice
+    # ✅ Índice por casilla: con muchos poderes no se recorre la lista en cada paso
+    return IndicePoderes(generarPoderes(cantidad, ancho))
+
+
+class SalidaAgrupada(io.StringIO):
+    """Junta los mensajes de un lote y los escribe en la consola de una sola vez"""
+    def volcar(self):
+        texto = self.getvalue()
+        if texto:
+            sys.stdout.write(texto)
+            sys.stdout.flush()
+            self.seek(0)
+            self.truncate()
+
+
+class FiltroRepeticiones(logging.Filter):
+    """Deja pasar como máximo `maximo` mensajes con la misma plantilla por ventana de `segundos`.
+    En la consola la plantilla alcanza: lo que se repite es "se ha movido" con otra posición,
+    y comparar antes de formatear evita armar el texto de cada paso de un lote grande.
+    WARNING o más siempre pasan."""
+    def __init__(self, maximo=5, segundos=1.0):
+        super().__init__()
+        self.maximo = maximo
+        self.segundos = segundos
+        self.ventanas = {}  # (logger, plantilla) -> [inicio, cuenta, suprimidos]; hay pocas plantillas
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        clave = (record.name, record.msg)
+        ahora = time.monotonic()
+        ventana = self.ventanas.get(clave)
+        if ventana is None or ahora - ventana[0] >= self.segundos:
+            suprimidos = ventana[2] if ventana else 0
+            self.ventanas[clave] = [ahora, 1, 0]
+            if suprimidos:
+                record.msg = f"{record.msg} (+{suprimidos} repetidos omitidos)"
+            return True
+        ventana[1] += 1
+        if ventana[1] <= self.maximo:
+            return True
+        ventana[2] += 1
+        return False
+
+
+class Partida:
+    def __init__(self, indice, mario, salida, silencioso=False):
+        self.indice = indice
+        self.mario = mario
+        self.salida = salida
+        self.silencioso = silencioso
+        self.acciones = 0
+        self.lotes = 0
+
+    def recoger(self):
+        for poder in self.indice.en(self.mario.posicionX, self.mario.posicionY):
+            self.mario.recogerPoder(poder)
+
+    def mostrarTodo(self):
+        self.recoger()
+        if not self.silencioso:
+            self.salida.write(f"{self.mario}\nPoderes activos: {self.indice.activos()}\n")
+
+    def jugadaInicial(self):
+        """Los movimientos con los que empieza toda partida, antes de leer acciones"""
+        for _ in range(4):
+            self.mario.mover(1, 0)
+        self.mostrarTodo()
+        self.mario.mover(1, 0)
+        self.mostrarTodo()
+        self.salida.volcar()
+
+    def aplicarLote(self, lote):
+        """Aplica un lote de acciones; devuelve False si alguna pidió salir"""
+        mario = self.mario
+        seguir = True
+        movimientos = []
+        for accion in lote:
+            if accion >= SALIR:
+                seguir = False
+                break
+            movimiento = ACCIONES.get(accion)
+            if movimiento:
+                movimientos.append(movimiento)
+        # Recoger no cambia el camino: se calculan todas las casillas del lote y el
+        # índice dice de una vez en cuáles puede haber algo para recoger
+        x, y = mario.posicionX, mario.posicionY
+        casillas = []
+        for dx, dy in movimientos:
+            x += dx
+            y += dy
+            casillas.append((x, y))
+        for movimiento, hay_poderes in zip(movimientos, self.indice.candidatas(casillas)):
+            mario.mover(*movimiento)
+            if hay_poderes:
+                self.recoger()
+        self.acciones += len(movimientos)
+        self.lotes += 1
+        if movimientos and not self.silencioso:
+            self.salida.write(f"{mario}\nPoderes activos: {self.indice.activos()}\n")
+        self.salida.volcar()
+        return seguir
+
+    async def consumir(self, bloques, al_terminar_lote=None):
+        """Convierte bloques de bytes en lotes de acciones (una por línea) y los aplica.
+        Devuelve False si se pidió salir, True si se acabaron los bloques."""
+        resto = b""
+        async for bloque in bloques:
+            lineas = (resto + bloque).split(b"\n")
+            resto = lineas.pop()
+            if not self.aplicarLote(self.leerAcciones(lineas)):
+                return False
+            if al_terminar_lote:
+                al_terminar_lote()
+            await asyncio.sleep(0)  # deja pasar a las otras conexiones entre lotes
+        if resto.strip():
+            return self.aplicarLote(self.leerAcciones([resto]))
+        return True
+
+    def leerAcciones(self, lineas):
+        acciones = []
+        for linea in lineas:
+            linea = linea.strip()
+            if not linea:
+                continue
+            try:
+                acciones.append(int(linea))
+            except ValueError:
+                registro.warning("Acción no válida: %r", linea.decode(errors="replace"))
+        return acciones
+
+
+# --- Fuentes de acciones ---------------------------------------------------------
+
+async def bloquesArchivo(archivo):
+    while True:
+        bloque = archivo.read(TAM_BLOQUE)
+        if not bloque:
+            return
+        yield bloque
+
+
+async def bloquesLector(lector):
+    while True:
+        bloque = await lector.read(TAM_BLOQUE)
+        if not bloque:
+            return
+        yield bloque
+
+
+async def bloquesEntrada():
+    """Bloques de la entrada estándar (terminal o tubería) leídos en un hilo aparte.
+    No se usa connect_read_pipe: en Windows el bucle no acepta la consola y en Unix
+    deja la terminal (y con ella stdout) sin bloqueo. El hilo es daemon y lee con
+    os.read, así Ctrl+C o un 5 terminan sin esperar a que llegue otra línea."""
+    bucle = asyncio.get_running_loop()
+    cola = asyncio.Queue(maxsize=4)  # la tubería no se lee toda a memoria si el juego va atrás
+
+    def leer():
+        while True:
+            try:
+                bloque = os.read(sys.stdin.fileno(), TAM_BLOQUE)
+            except OSError:
+                bloque = b""
+            try:
+                asyncio.run_coroutine_threadsafe(cola.put(bloque), bucle).result()
+            except RuntimeError:
+                return  # el bucle ya terminó
+            if not bloque:
+                return
+
+    threading.Thread(target=leer, daemon=True).start()
+    while True:
+        bloque = await cola.get()
+        if not bloque:
+            return
+        yield bloque
+
+
+async def jugarInteractivo(partida):
+    # El menú se muestra una vez; después cada línea es un lote
+    partida.salida.write("1. Adelante\n2. Atras\n3. Subir\n4. Bajar\n5. Salir\n")
+    partida.salida.write("Ingrese la accion: ")
+    partida.salida.volcar()
+
+    def pedirOtra():
+        sys.stdout.write("Ingrese la accion: ")
+        sys.stdout.flush()
+
+    await partida.consumir(bloquesEntrada(), pedirOtra)
+
+
+async def servir(partida, puerto):
+    """Atiende conexiones hasta que alguna manda salir (5) o llega Ctrl+C / SIGTERM"""
+    terminar = asyncio.Event()
+
+    async def atender(lector, escritor):
+        print(f"Conexión de {escritor.get_extra_info('peername')}", flush=True)
+        seguir = await partida.consumir(bloquesLector(lector))
+        escritor.close()
+        partida.salida.volcar()
+        print(f"{partida.mario} tras {partida.acciones} acciones", flush=True)
+        if not seguir:
+            terminar.set()
+
+    bucle = asyncio.get_running_loop()
+    for senal in (signal.SIGINT, signal.SIGTERM):
+        try:
+            bucle.add_signal_handler(senal, terminar.set)
+        except NotImplementedError:
+            pass  # Windows: Ctrl+C corta sin resumen; mandar 5 sí lo muestra
+    servidor = await asyncio.start_server(atender, "127.0.0.1", puerto)
+    print(f"Esperando acciones en el puerto {puerto}", flush=True)
+    async with servidor:
+        await terminar.wait()
+
+
+async def principal(argumentos, opciones):
+    silencioso = "--silencioso" in argumentos
+    salida = SalidaAgrupada()
+    # Los mensajes de movimiento y de estado de los poderes salen por logging, se
+    # limitan por plantilla y se juntan por lote; --silencioso o MARIO_LOG=WARNING
+    # los apaga sin tocar el código
+    nivel = "WARNING" if silencioso else os.environ.get("MARIO_LOG", "INFO")
+    # El formato es solo el mensaje: no se busca el archivo y la línea de cada llamada
+    # ni el hilo o proceso (ver "Optimization" en la documentación de logging)
+    logging._srcfile = None
+    logging.logThreads = logging.logProcesses = logging.logMultiprocessing = False
+    manejador = logging.StreamHandler(salida)
+    manejador.addFilter(FiltroRepeticiones())
+    logging.basicConfig(level=nivel, format="%(message)s", handlers=[manejador])
+
+    numeros = [a for a in argumentos if not a.startswith("--")]
+    indice = crearPoderes(int(numeros[0]) if numeros else 10)
+    partida = Partida(indice, Jugador(1, "Mario"), salida, silencioso)
+
+    inicio = time.perf_counter()
+    partida.jugadaInicial()
+    if "archivo" in opciones:
+        with open(opciones["archivo"], "rb") as archivo:
+            await partida.consumir(bloquesArchivo(archivo))
+    elif "puerto" in opciones:
+        await servir(partida, int(opciones["puerto"]))
+    elif sys.stdin.isatty():
+        await jugarInteractivo(partida)
+    elif stat.S_ISREG(os.fstat(sys.stdin.fileno()).st_mode):
+        # Entrada redirigida desde un archivo: no se puede vigilar con el bucle de eventos
+        await partida.consumir(bloquesArchivo(sys.stdin.buffer))
+    else:
+        await partida.consumir(bloquesEntrada())
+    duracion = time.perf_counter() - inicio
+    salida.volcar()
+    print(f"{partida.mario}\nPoderes activos: {indice.activos()}")
+    print(f"{partida.acciones} acciones en {partida.lotes} lotes, {duracion:.2f} s "
+          f"({partida.acciones / max(duracion, 1e-9):.0f} acciones/s)")
+
+
+if __name__ == "__main__":
+    opciones = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+    try:
+        asyncio.run(principal(sys.argv[1:], opciones))
+    except KeyboardInterrupt:
+        pass
@@ -1,6 +1,11 @@
 #Los personajes del Juego tanto Jugador como enemigos
-from Poder import Hongo, Planta
+import logging
+from Poder import Hongo, Planta, VistaHongo, VistaPlanta
+
+registro = logging.getLogger(__name__)
+
 class Personaje:
+    __slots__ = ("id", "nombre", "posicionX", "posicionY", "estado")
     id: int
     nombre: str
     posicionX: int
@@ -20,12 +25,13 @@ class Personaje:
     def mover(self, x=0, y=0):
         self.posicionX += x
         self.posicionY += y
-        print(f"El personaje {self.nombre} se ha movido a la posicion ({self.posicionX}, {self.posicionY})")
+        registro.info("El personaje %s se ha movido a la posicion (%s, %s)", self.nombre, self.posicionX, self.posicionY)
 
 class Jugador(Personaje):
+    __slots__ = ("vidas", "tamano", "dispara", "monedas", "puntos", "tiempo")
     vidas: int
     tamano: str
-    dispara: bool = False
+    dispara: bool
     monedas: int
     puntos: int
     tiempo: int
@@ -35,6 +41,7 @@ class Jugador(Personaje):
         super().__init__(id, nombre, 0, 0, "Vivo")
         self.vidas = 3
         self.tamano = "enano"
+        self.dispara = False
         self.monedas = 0
         self.puntos = 0
         self.tiempo = 300
@@ -43,16 +50,16 @@ class Jugador(Personaje):
         return f" ({self.nombre}, {self.posicionX}, {self.posicionY}, {self.tamano})"
 
     def recogerPoder(self, poder):
-        if isinstance(poder, Hongo):
+        if isinstance(poder, (Hongo, VistaHongo)):
             if poder.tipo == "Rojo":
                 self.tamano = "grande"
             elif poder.tipo == "Verde":
                 self.vidas += 1
             poder.setEstado("recogido")
-            print(f"El jugador {self.nombre} ha recogido el poder {poder.nombre}")
-        elif isinstance(poder, Planta):
+            registro.info("El jugador %s ha recogido el poder %s", self.nombre, poder.nombre)
+        elif isinstance(poder, (Planta, VistaPlanta)):
             self.dispara = True
             poder.setEstado("recogido")
-            print(f"El jugador {self.nombre} ha recogido el poder {poder.nombre}")
+            registro.info("El jugador %s ha recogido el poder %s", self.nombre, poder.nombre)
         else:
-            print("Poder no reconocido")
\ No newline at end of file
+            registro.warning("Poder no reconocido")
\ No newline at end of file
@@ -1,5 +1,59 @@
 #Clase que define los poderes que puede recoger los jugadores de mario bros
+import logging
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: sin él solo se usan los objetos Poder de siempre
+    np = None
+
+registro = logging.getLogger(__name__)
+
+class IndicePoderes:
+    """Poderes activos por casilla (posicionX, posicionY): ver qué hay donde está el jugador es O(1).
+    Los poderes agregados avisan al índice cuando cambian de estado o se mueven."""
+    def __init__(self, poderes=()):
+        self.casillas = {}
+        self.total = 0
+        for poder in poderes:
+            self.agregar(poder)
+
+    def __len__(self):
+        return self.total
+
+    def agregar(self, poder):
+        poder.indice = self
+        self.insertar(poder)
+
+    def insertar(self, poder):
+        if poder.estado == "activo":
+            self.casillas.setdefault((poder.posicionX, poder.posicionY), []).append(poder)
+            self.total += 1
+
+    def quitar(self, poder):
+        if poder.estado != "activo":
+            return
+        clave = (poder.posicionX, poder.posicionY)
+        lista = self.casillas.get(clave)
+        if lista and poder in lista:
+            lista.remove(poder)
+            self.total -= 1
+            if not lista:
+                del self.casillas[clave]
+
+    def en(self, x, y):
+        """Poderes activos en la casilla (una copia: se pueden recoger mientras se recorre)"""
+        return tuple(self.casillas.get((x, y), ()))
+
+    def activos(self):
+        return self.total
+
+    def candidatas(self, casillas):
+        """Para cada casilla (x, y), si hay algún poder activo en ella"""
+        return [c in self.casillas for c in casillas]
+
+
 class Poder:
+    __slots__ = ("id", "nombre", "descripcion", "posicionX", "posicionY", "estado", "indice")
     id: int
     nombre: str
     descripcion: str
@@ -14,15 +68,21 @@ class Poder:
         self.posicionX = posicionX
         self.posicionY = posicionY
         self.estado = estado
+        self.indice = None
      
     def __str__(self):
         return f"Poder (nombre={self.nombre}, descripcion={self.descripcion}, posicionX={self.posicionX}, posicionY={self.posicionY})"
     
     def setEstado(self, estado):
+        if self.indice is not None:
+            self.indice.quitar(self)
         self.estado = estado
-        print(f"El poder {self.nombre} ha cambiado su estado a {self.estado}")
+        if self.indice is not None:
+            self.indice.insertar(self)
+        registro.info("El poder %s ha cambiado su estado a %s", self.nombre, self.estado)
 
 class Hongo(Poder):
+    __slots__ = ("tipo",)
     tipo: str 
     def __init__(self, id, nombre, descripcion, posicionX, posicionY, estado, tipo):
         super().__init__(id, nombre, descripcion, posicionX, posicionY, estado)
@@ -30,15 +90,301 @@ class Hongo(Poder):
     
         
     def mover(self, x=0, y=0):
+        if self.indice is not None:
+            self.indice.quitar(self)
         self.posicionX += x
         self.posicionY += y
-        print(f"El hongo se ha movido a la posicion ({self.posicionX}, {self.posicionY})")
+        if self.indice is not None:
+            self.indice.insertar(self)
+        registro.info("El hongo se ha movido a la posicion (%s, %s)", self.posicionX, self.posicionY)
 
 
 class Planta(Poder):
+    __slots__ = ()
+
     def __init__(self, id, nombre, descripcion, posicionX, posicionY, estado):
         super().__init__(id, nombre, descripcion, posicionX, posicionY, estado)
     
     def __str__(self):
-        return f"Hongo (tipo={self.tipo}, descripcion={self.descripcion}, id={self.id})"
-    
+        return f"Planta (nombre={self.nombre}, descripcion={self.descripcion}, id={self.id})"
+
+
+# --- Registro en columnas ------------------------------------------------------
+# Para millones de poderes: en vez de un objeto por poder, una columna de NumPy
+# por atributo (id, clase, tipo, posición, estado). El nombre y la descripción
+# salen de la clase y el tipo. Los objetos Poder se arman solo cuando se piden.
+
+HONGO = 0
+PLANTA = 1
+TIPOS = ("", "Rojo", "Verde")  # el tipo 0 es el de las plantas
+NOMBRES = {
+    (HONGO, 1): ("Hongo Rojo", "Hongo que hace crecer a Mario"),
+    (HONGO, 2): ("Hongo Verde", "Hongo que hace crecer a Mario"),
+    (PLANTA, 0): ("Planta Fuego", "Planta que lanza fuego"),
+}
+ACTIVO = 0
+
+
+def numpy_disponible():
+    return np is not None
+
+
+class VistaPoder:
+    """Lee y escribe una fila del registro con la forma de un Poder (solo guarda el registro y la fila)"""
+    __slots__ = ("poderes", "fila")
+
+    def __init__(self, poderes, fila):
+        self.poderes = poderes
+        self.fila = fila
+
+    def __str__(self):
+        return f"Poder (nombre={self.nombre}, descripcion={self.descripcion}, posicionX={self.posicionX}, posicionY={self.posicionY})"
+
+    @property
+    def id(self):
+        return int(self.poderes.ids[self.fila])
+
+    @property
+    def nombre(self):
+        return NOMBRES[self.poderes.clase[self.fila], self.poderes.tipo[self.fila]][0]
+
+    @property
+    def descripcion(self):
+        return NOMBRES[self.poderes.clase[self.fila], self.poderes.tipo[self.fila]][1]
+
+    @property
+    def posicionX(self):
+        return int(self.poderes.x[self.fila])
+
+    @property
+    def posicionY(self):
+        return int(self.poderes.y[self.fila])
+
+    @property
+    def estado(self):
+        return self.poderes.estados[self.poderes.estado[self.fila]]
+
+    @property
+    def tipo(self):
+        return TIPOS[self.poderes.tipo[self.fila]]
+
+    def setEstado(self, estado):
+        self.poderes.estado[self.fila] = self.poderes.codigoEstado(estado)
+        registro.info("El poder %s ha cambiado su estado a %s", self.nombre, estado)
+
+
+class VistaHongo(VistaPoder):
+    __slots__ = ()
+
+    def mover(self, x=0, y=0):
+        self.poderes.moverFila(self.fila, x, y)
+        registro.info("El hongo se ha movido a la posicion (%s, %s)", self.posicionX, self.posicionY)
+
+
+class VistaPlanta(VistaPoder):
+    __slots__ = ()
+
+    def __str__(self):
+        return f"Planta (nombre={self.nombre}, descripcion={self.descripcion}, id={self.id})"
+
+
+class RegistroPoderes:
+    """Poderes en columnas de NumPy. Para buscar por casilla las filas se ordenan por clave
+    (indexar); lo que se agrega o se mueve después va a una capa chica encima (nuevas) y su
+    lugar viejo en el orden se marca como desviado, hasta el siguiente indexar."""
+    _COLUMNAS = ("ids", "clase", "tipo", "x", "y", "estado")
+    MAXIMO_SUPERPUESTAS = 4096  # filas fuera del orden a partir de las cuales se mezclan solas
+
+    def __init__(self, capacidad=1024):
+        if np is None:
+            raise ImportError("RegistroPoderes necesita numpy (pip install numpy)")
+        self.n = 0
+        self.siguiente_id = 1
+        self.ids = np.zeros(capacidad, dtype=np.int64)
+        self.clase = np.zeros(capacidad, dtype=np.int8)
+        self.tipo = np.zeros(capacidad, dtype=np.int8)
+        self.x = np.zeros(capacidad, dtype=np.int32)
+        self.y = np.zeros(capacidad, dtype=np.int32)
+        self.estado = np.zeros(capacidad, dtype=np.int8)
+        self.estados = ["activo", "recogido"]  # código -> nombre del estado
+        self.orden = None  # (filas ordenadas por casilla, claves ordenadas), ver indexar
+        self.indexadas = 0  # las filas 0..indexadas-1 están en orden
+        self.nuevas = {}  # clave -> filas agregadas o movidas a esa casilla después de indexar
+        self.desviadas = {}  # fila -> clave con la que está en orden (esa entrada ya no vale)
+        self.desviadas_por_clave = {}  # clave -> cuántas entradas del orden con esa clave ya no valen
+
+    def __len__(self):
+        return self.n
+
+    def _reservar(self, cantidad):
+        if self.n + cantidad <= len(self.x):
+            return
+        capacidad = max(len(self.x) * 2, self.n + cantidad)
+        for nombre in self._COLUMNAS:
+            viejo = getattr(self, nombre)
+            nuevo = np.zeros(capacidad, dtype=viejo.dtype)
+            nuevo[:self.n] = viejo[:self.n]
+            setattr(self, nombre, nuevo)
+
+    def codigoEstado(self, estado):
+        if estado not in self.estados:
+            self.estados.append(estado)
+        return self.estados.index(estado)
+
+    def agregar(self, clase, tipo, x, y):
+        """Agrega un poder activo y devuelve su fila"""
+        self._reservar(1)
+        i = self.n
+        self.ids[i] = self.siguiente_id
+        self.clase[i] = clase
+        self.tipo[i] = TIPOS.index(tipo)
+        self.x[i] = x
+        self.y[i] = y
+        self.estado[i] = ACTIVO
+        self.n += 1
+        self.siguiente_id += 1
+        if self.orden is not None:
+            self.nuevas.setdefault(self._clave(x, y), []).append(i)
+            self._mezclarSiHaceFalta()
+        return i
+
+    def moverFila(self, fila, dx, dy):
+        """Mueve un poder y lo pasa a la capa de nuevas, sin reordenar el registro"""
+        vieja = self._clave(self.x[fila], self.y[fila])
+        self.x[fila] += dx
+        self.y[fila] += dy
+        if self.orden is None:
+            return
+        lista = self.nuevas.get(vieja)
+        if lista and fila in lista:
+            lista.remove(fila)
+            if not lista:
+                del self.nuevas[vieja]
+        if fila < self.indexadas and fila not in self.desviadas:
+            self.desviadas[fila] = vieja
+            self.desviadas_por_clave[vieja] = self.desviadas_por_clave.get(vieja, 0) + 1
+        self.nuevas.setdefault(self._clave(self.x[fila], self.y[fila]), []).append(fila)
+        self._mezclarSiHaceFalta()
+
+    def generar(self, cantidad, ancho, alto, semilla=None):
+        """Agrega `cantidad` poderes activos al azar en 1..ancho x 0..alto, en una sola pasada por columna"""
+        rng = np.random.default_rng(semilla)
+        self._reservar(cantidad)
+        fin = self.n + cantidad
+        filas = slice(self.n, fin)
+        self.ids[filas] = np.arange(self.siguiente_id, self.siguiente_id + cantidad)
+        # Un tercio de plantas y el resto hongos rojos o verdes, como generarPoderes en Juego.py
+        eleccion = rng.integers(0, 3, cantidad, dtype=np.int8)
+        self.clase[filas] = eleccion == 2
+        self.tipo[filas] = np.where(eleccion == 2, 0, eleccion + 1)
+        self.x[filas] = rng.integers(1, ancho + 1, cantidad, dtype=np.int32)
+        self.y[filas] = rng.integers(0, alto + 1, cantidad, dtype=np.int32)
+        self.estado[filas] = ACTIVO
+        self.n = fin
+        self.siguiente_id += cantidad
+        self.orden = None
+        self.indexar()  # el argsort se paga aquí y no en la primera búsqueda de la partida
+
+    def activos(self):
+        return int(np.count_nonzero(self.estado[:self.n] == ACTIVO))
+
+    def vista(self, fila):
+        """VistaHongo o VistaPlanta que lee y escribe la fila; sirve para Jugador.recogerPoder"""
+        clase = VistaPlanta if self.clase[fila] == PLANTA else VistaHongo
+        return clase(self, fila)
+
+    def _claves(self, x, y):
+        # Una clave int64 por casilla: x en los 32 bits altos, y (corrida a positivo) en los bajos
+        return (np.asarray(x, dtype=np.int64) << 32) + (np.asarray(y, dtype=np.int64) + 2 ** 31)
+
+    def _clave(self, x, y):
+        return (int(x) << 32) + (int(y) + 2 ** 31)
+
+    def _mezclarSiHaceFalta(self):
+        if len(self.desviadas) + self.n - self.indexadas > self.MAXIMO_SUPERPUESTAS:
+            self.indexar()
+
+    def indexar(self):
+        """Deja todas las filas en el orden por casilla que usan en() y candidatas().
+        La primera vez es un argsort de todo el registro (~1.5 s con 10 millones; generar lo hace
+        al final). Después solo mezcla la capa de nuevas: quita las entradas desviadas e inserta
+        las nuevas en su lugar, sin volver a ordenar."""
+        if self.orden is None:
+            claves = self._claves(self.x[:self.n], self.y[:self.n])
+            filas = np.argsort(claves).astype(np.int32 if self.n < 2 ** 31 else np.int64)
+            self.orden = (filas, claves[filas])
+        elif self.nuevas or self.desviadas:
+            filas, claves = self.orden
+            if self.desviadas:
+                posiciones = []
+                for fila, clave in self.desviadas.items():
+                    desde = np.searchsorted(claves, clave, "left")
+                    hasta = np.searchsorted(claves, clave, "right")
+                    posiciones.append(desde + np.flatnonzero(filas[desde:hasta] == fila)[0])
+                filas = np.delete(filas, posiciones)
+                claves = np.delete(claves, posiciones)
+            if self.nuevas:
+                agregadas = np.fromiter((f for lista in self.nuevas.values() for f in lista), dtype=filas.dtype)
+                claves_agregadas = self._claves(self.x[agregadas], self.y[agregadas])
+                orden = np.argsort(claves_agregadas)
+                agregadas, claves_agregadas = agregadas[orden], claves_agregadas[orden]
+                donde = np.searchsorted(claves, claves_agregadas)
+                filas = np.insert(filas, donde, agregadas)
+                claves = np.insert(claves, donde, claves_agregadas)
+            self.orden = (filas, claves)
+        self.indexadas = self.n
+        self.nuevas = {}
+        self.desviadas = {}
+        self.desviadas_por_clave = {}
+        return self.orden
+
+    def en(self, x, y):
+        """Poderes activos en la casilla (x, y): búsqueda binaria sobre las filas ordenadas por casilla,
+        sin las desviadas, más las de la capa de nuevas"""
+        filas, claves = self.orden or self.indexar()
+        clave = self._clave(x, y)
+        desde = np.searchsorted(claves, clave, "left")
+        hasta = np.searchsorted(claves, clave, "right")
+        encontradas = filas[desde:hasta].tolist()
+        if clave in self.desviadas_por_clave:
+            encontradas = [f for f in encontradas if f not in self.desviadas]
+        encontradas += self.nuevas.get(clave, ())
+        return tuple(self.vista(f) for f in encontradas if self.estado[f] == ACTIVO)
+
+    def candidatas(self, casillas):
+        """Para cada casilla (x, y), si tiene algún poder (activo o no): una sola búsqueda para todo el lote"""
+        if not casillas or not self.n:
+            return [False] * len(casillas)
+        _, claves = self.orden or self.indexar()
+        xs, ys = zip(*casillas)
+        buscadas = self._claves(xs, ys)
+        if len(claves):
+            pos = np.minimum(np.searchsorted(claves, buscadas), len(claves) - 1)
+            hay = claves[pos] == buscadas
+        else:
+            hay = np.zeros(len(buscadas), dtype=bool)
+        if self.desviadas_por_clave:
+            # Una casilla cuyas entradas en el orden están todas desviadas ya no tiene nada
+            con_desviadas = np.fromiter(self.desviadas_por_clave, dtype=np.int64, count=len(self.desviadas_por_clave))
+            for i in np.flatnonzero(hay & np.isin(buscadas, con_desviadas)):
+                clave = int(buscadas[i])
+                total = np.searchsorted(claves, clave, "right") - np.searchsorted(claves, clave, "left")
+                if total <= self.desviadas_por_clave[clave]:
+                    hay[i] = False
+        if self.nuevas:
+            hay |= np.isin(buscadas, np.fromiter(self.nuevas, dtype=np.int64, count=len(self.nuevas)))
+        return hay
+
+    def setEstadoEnRegion(self, x0, y0, x1, y1, estado, solo_activos=True):
+        """Cambia el estado de todos los poderes en el rectángulo [x0, x1] x [y0, y1]. Devuelve cuántos cambiaron."""
+        x, y = self.x[:self.n], self.y[:self.n]
+        en_region = (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+        if solo_activos:
+            en_region &= self.estado[:self.n] == ACTIVO
+        self.estado[:self.n][en_region] = self.codigoEstado(estado)
+        cambiados = int(np.count_nonzero(en_region))
+        registro.info("%d poderes en (%s, %s)-(%s, %s) cambiaron su estado a %s", cambiados, x0, y0, x1, y1, estado)
+        return cambiados
+
+    def recogerEnRegion(self, x0, y0, x1, y1):
+        return self.setEstadoEnRegion(x0, y0, x1, y1, "recogido")
@@ -0,0 +1,129 @@
+# Carga de audio en segundo plano.
+# La música de fondo se reproduce en streaming con pygame.mixer.music (solo se
+# busca el archivo). Los efectos cortos se recortan (silencio al inicio y al
+# final), se convierten al formato del mezclador y se guardan en assets/cache,
+# así las siguientes ejecuciones los cargan sin decodificar ni remuestrear.
+# Como el atlas de Recursos.py, la caché se nombra por la fecha y el tamaño del
+# WAV (no se lee el original) y guarda un crc32 de las muestras para detectar
+# archivos cortados o dañados:  largo (I) | crc32 (I) | muestras crudas
+import array
+import hashlib
+import os
+import struct
+import threading
+import zlib
+
+import pygame
+
+import Registro
+
+registro = Registro.obtener("audio")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SOUNDS_DIR = os.path.join(BASE_DIR, "assets", "sounds")
+CACHE_DIR = os.environ.get("MARIO_CACHE") or os.path.join(BASE_DIR, "assets", "cache")
+
+FORMATOS_MUSICA = ["Tono.wav", "fondo.mp3", "fondo.wav", "fondo.ogg", "background.mp3", "background.wav", "music.mp3"]
+UMBRAL_SILENCIO = 200  # amplitud máxima (16 bits) que se considera silencio
+VERSION_CACHE = 2
+CABECERA = struct.Struct("<II")
+
+
+def recortar_silencio(crudo, tamano, canales):
+    """Quita los frames silenciosos del inicio y del final (solo audio de 16 bits)"""
+    if abs(tamano) != 16:
+        return crudo
+    muestras = array.array("h")
+    muestras.frombytes(crudo)
+    inicio = 0
+    while inicio < len(muestras) and abs(muestras[inicio]) <= UMBRAL_SILENCIO:
+        inicio += 1
+    fin = len(muestras)
+    while fin > inicio and abs(muestras[fin - 1]) <= UMBRAL_SILENCIO:
+        fin -= 1
+    # Alinear a frames completos
+    inicio -= inicio % canales
+    fin += (-fin) % canales
+    return muestras[inicio:fin].tobytes()
+
+
+class CargadorAudio:
+    def __init__(self, directorio=SOUNDS_DIR, cache=CACHE_DIR):
+        self.directorio = directorio
+        self.cache = cache
+        self.sonido_moneda = None
+        self.musica_fondo = None
+        self.listo = threading.Event()
+        self.hilo = threading.Thread(target=self._cargar, name="cargador-audio", daemon=True)
+
+    def iniciar(self):
+        self.hilo.start()
+        return self
+
+    def _cargar(self):
+        try:
+            self.musica_fondo = self.buscar_musica()
+            self.sonido_moneda = self.cargar_efecto("Moneda.wav", 0.15)
+        except Exception as e:
+            registro.warning("⚠️ Error al cargar audio: %s", e)
+        finally:
+            self.listo.set()
+
+    def buscar_musica(self):
+        for nombre_archivo in FORMATOS_MUSICA:
+            music_path = os.path.join(self.directorio, nombre_archivo)
+            if os.path.exists(music_path):
+                registro.info("🎵 Música de fondo encontrada: %s", nombre_archivo)
+                return music_path
+        registro.warning("⚠️ No se encontró música de fondo")
+        return None
+
+    def cargar_efecto(self, nombre, volumen):
+        ruta = os.path.join(self.directorio, nombre)
+        if not os.path.exists(ruta):
+            registro.warning("⚠️ Archivo de sonido no encontrado: %s", ruta)
+            return None
+        formato = pygame.mixer.get_init()
+        if formato is None:
+            return None
+        frecuencia, tamano, canales = formato
+        info = os.stat(ruta)
+        huella = hashlib.sha1(f"{VERSION_CACHE}:{info.st_mtime_ns}:{info.st_size}".encode()).hexdigest()[:16]
+        base = os.path.splitext(nombre)[0]
+        ruta_cache = os.path.join(self.cache, f"{base}_{huella}_{frecuencia}_{tamano}_{canales}.raw")
+
+        crudo = self.leer_cache(ruta_cache)
+        if crudo is None:
+            original = pygame.mixer.Sound(ruta)
+            crudo = recortar_silencio(original.get_raw(), tamano, canales)
+            try:
+                os.makedirs(self.cache, exist_ok=True)
+                # Borrar las versiones viejas de este efecto
+                for viejo in os.listdir(self.cache):
+                    if viejo.startswith(f"{base}_") and viejo.endswith(".raw"):
+                        os.remove(os.path.join(self.cache, viejo))
+                temporal = ruta_cache + ".tmp"
+                with open(temporal, "wb") as f:
+                    f.write(CABECERA.pack(len(crudo), zlib.crc32(crudo)))
+                    f.write(crudo)
+                os.replace(temporal, ruta_cache)
+            except OSError as e:
+                registro.warning("⚠️ No se pudo guardar %s en caché: %s", nombre, e)
+        sonido = pygame.mixer.Sound(buffer=crudo)
+        sonido.set_volume(volumen)
+        registro.info("✅ Sonido %s cargado con volumen reducido", base)
+        return sonido
+
+    def leer_cache(self, ruta_cache):
+        """Muestras guardadas, o None si no están o no coinciden el largo o el crc"""
+        try:
+            with open(ruta_cache, "rb") as f:
+                contenido = f.read()
+            largo, crc = CABECERA.unpack_from(contenido, 0)
+        except (OSError, struct.error):
+            return None
+        crudo = contenido[CABECERA.size:]
+        if len(crudo) != largo or zlib.crc32(crudo) != crc:
+            registro.warning("⚠️ Caché de audio no válida, se vuelve a generar: %s", ruta_cache)
+            return None
+        return crudo
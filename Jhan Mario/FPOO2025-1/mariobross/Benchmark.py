@@ -0,0 +1,225 @@
+# Benchmarks de rendimiento de los dos juegos, sin pantalla (drivers dummy de SDL).
+# Mide Prueba.Juego.actualizar con distintas cantidades de entidades, dibujar,
+# generar_monedas y el arranque en frío y en caliente de Prueba.Juego() y
+# Game.Game(). El resultado se guarda en JSON y se puede comparar con una base
+# guardada para detectar regresiones.
+#
+# Uso:
+#   python Benchmark.py [--salida=resultado.json] [--comparar=base.json] [--tolerancia=0.10] [--rapido]
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("MARIO_HEADLESS", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+VERSION_RESULTADOS = 1
+CANTIDADES_ENTIDADES = (10, 100, 1000)
+FRAMES_POR_LOTE = 100
+
+
+def medir(preparar, ejecutar, lotes, por_lote=1):
+    """Mide `ejecutar` en varios lotes; `preparar` corre fuera del tiempo medido. Devuelve ms por llamada."""
+    tiempos = []
+    for _ in range(lotes):
+        estado = preparar()
+        inicio = time.perf_counter()
+        ejecutar(estado)
+        tiempos.append((time.perf_counter() - inicio) * 1000 / por_lote)
+    return resumen(tiempos)
+
+
+def resumen(tiempos):
+    ordenados = sorted(tiempos)
+    return {
+        "mediana_ms": statistics.median(ordenados),
+        "media_ms": statistics.fmean(ordenados),
+        "min_ms": ordenados[0],
+        "max_ms": ordenados[-1],
+        "desviacion_ms": statistics.pstdev(ordenados),
+        "lotes": len(ordenados),
+    }
+
+
+# --- Prueba.Juego -----------------------------------------------------------
+
+def juego_con_enemigos(cantidad, usar_almacen=False, headless=True):
+    """Juego con `cantidad` enemigos repartidos a lo ancho de la pantalla y sin aparición de nuevos"""
+    from Prueba import Juego, ANCHO_VENTANA
+    juego = Juego(headless=headless, usar_almacen=usar_almacen, semilla=0)
+    juego.max_enemigos_simultaneos = juego.max_enemigos_total = cantidad
+    for _ in range(cantidad):
+        juego.generar_enemigo()
+    juego.tiempo_minimo_entre_enemigos = float("inf")
+    juego.jugador.vidas = 10 ** 9  # que el juego no termine en medio de la medición
+    if usar_almacen:
+        n = juego.almacen_enemigos.n
+        for i in range(n):
+            juego.almacen_enemigos.x[i] = ANCHO_VENTANA * (1 + i) / n
+    else:
+        enemigos = juego.goombas.activos + juego.tortugas.activos
+        for i, e in enumerate(enemigos):
+            e.x = ANCHO_VENTANA * (1 + i) // len(enemigos)
+            e.rect.x = e.x
+    return juego
+
+
+def avanzar(juego, frames=FRAMES_POR_LOTE):
+    for _ in range(frames):
+        juego.actualizar()
+
+
+def casos_prueba(lotes):
+    import Entidades
+    resultados = {}
+    modos = [("objetos", False)]
+    if Entidades.numpy_disponible():
+        modos.append(("almacen", True))
+    for nombre_modo, usar_almacen in modos:
+        for cantidad in CANTIDADES_ENTIDADES:
+            resultados[f"prueba.actualizar.{nombre_modo}.{cantidad}"] = medir(
+                lambda: juego_con_enemigos(cantidad, usar_almacen), avanzar, lotes, FRAMES_POR_LOTE)
+
+    juego = juego_con_enemigos(10, headless=False)
+    juego.dibujar()  # cargar sprites antes de medir
+    resultados["prueba.dibujar"] = medir(
+        lambda: juego, lambda j: [j.dibujar() for _ in range(FRAMES_POR_LOTE)], lotes, FRAMES_POR_LOTE)
+
+    from Instantanea import TAMANO, guardar_estado, restaurar_estado
+    juego = juego_con_enemigos(10)
+    registro = bytearray(TAMANO)
+    resultados["prueba.instantanea.guardar"] = medir(
+        lambda: juego, lambda j: [guardar_estado(j, registro) for _ in range(FRAMES_POR_LOTE)], lotes, FRAMES_POR_LOTE)
+    resultados["prueba.instantanea.restaurar"] = medir(
+        lambda: juego, lambda j: [restaurar_estado(j, registro) for _ in range(FRAMES_POR_LOTE)], lotes, FRAMES_POR_LOTE)
+
+    juego = juego_con_enemigos(0)
+    resultados["prueba.generar_monedas"] = medir(lambda: juego, lambda j: j.generar_monedas(), lotes * 10)
+    return resultados
+
+
+# --- Arranque (en un proceso nuevo para medir también los imports) ------------
+
+ARRANQUE_PRUEBA = """
+import time, json
+inicio = time.perf_counter()
+from Prueba import Juego
+juego = Juego()
+juego.dibujar()
+print(json.dumps({"ms": (time.perf_counter() - inicio) * 1000}))
+"""
+
+ARRANQUE_GAME = """
+import time, json
+inicio = time.perf_counter()
+try:
+    from Game import Game
+    juego = Game()
+    juego.root.update()
+except Exception as e:  # sin Tk o sin pantalla
+    print(json.dumps({"omitido": f"{type(e).__name__}: {e}"}))
+else:
+    print(json.dumps({"ms": (time.perf_counter() - inicio) * 1000}))
+    juego.root.destroy()
+"""
+
+
+def arrancar(codigo, cache):
+    entorno = dict(os.environ, MARIO_CACHE=cache, MARIO_LOG="WARNING")
+    salida = subprocess.run([sys.executable, "-c", codigo], cwd=BASE_DIR, env=entorno,
+                            capture_output=True, text=True)
+    lineas = salida.stdout.strip().splitlines()
+    if salida.returncode != 0 or not lineas:
+        return {"omitido": (salida.stderr.strip().splitlines() or ["error"])[-1]}
+    return json.loads(lineas[-1])
+
+
+def medir_arranque(codigo, lotes):
+    """Frío: caché vacía cada vez. Caliente: la caché ya existe."""
+    frio, caliente = [], []
+    for _ in range(lotes):
+        with tempfile.TemporaryDirectory() as cache:
+            r = arrancar(codigo, cache)
+            if "omitido" in r:
+                return {"omitido": r["omitido"]}, {"omitido": r["omitido"]}
+            frio.append(r["ms"])
+            caliente.append(arrancar(codigo, cache)["ms"])
+    return resumen(frio), resumen(caliente)
+
+
+def casos_arranque(lotes):
+    resultados = {}
+    for nombre, codigo in (("prueba", ARRANQUE_PRUEBA), ("game", ARRANQUE_GAME)):
+        frio, caliente = medir_arranque(codigo, lotes)
+        resultados[f"{nombre}.arranque.frio"] = frio
+        resultados[f"{nombre}.arranque.caliente"] = caliente
+    return resultados
+
+
+# --- Resultados ------------------------------------------------------------
+
+def ejecutar_todo(rapido=False):
+    import pygame
+    lotes = 3 if rapido else 10
+    resultados = {}
+    resultados.update(casos_prueba(lotes))
+    resultados.update(casos_arranque(2 if rapido else 5))
+    return {
+        "version": VERSION_RESULTADOS,
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+
+
+def comparar(actual, base, tolerancia):
+    """Lista de (nombre, ms base, ms actual, cambio relativo, es_regresion)"""
+    filas = []
+    for nombre, r in actual["resultados"].items():
+        b = base["resultados"].get(nombre)
+        if not b or "mediana_ms" not in b or "mediana_ms" not in r:
+            continue
+        cambio = r["mediana_ms"] / b["mediana_ms"] - 1 if b["mediana_ms"] else 0.0
+        filas.append((nombre, b["mediana_ms"], r["mediana_ms"], cambio, cambio > tolerancia))
+    return filas
+
+
+def imprimir(actual):
+    for nombre, r in actual["resultados"].items():
+        if "omitido" in r:
+            print(f"{nombre:<34} omitido ({r['omitido']})")
+        else:
+            print(f"{nombre:<34}{r['mediana_ms']:>10.3f} ms  (min {r['min_ms']:.3f}, ±{r['desviacion_ms']:.3f})")
+
+
+if __name__ == "__main__":
+    opciones = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+    actual = ejecutar_todo(rapido="--rapido" in sys.argv)
+    imprimir(actual)
+
+    if "salida" in opciones:
+        with open(opciones["salida"], "w", encoding="utf-8") as f:
+            json.dump(actual, f, indent=2, ensure_ascii=False)
+        print(f"💾 Resultados guardados en {opciones['salida']}")
+
+    if "comparar" in opciones:
+        with open(opciones["comparar"], encoding="utf-8") as f:
+            base = json.load(f)
+        tolerancia = float(opciones.get("tolerancia", 0.10))
+        regresiones = 0
+        print(f"\nComparación con {opciones['comparar']} (tolerancia {tolerancia:.0%}):")
+        for nombre, ms_base, ms_actual, cambio, regresion in comparar(actual, base, tolerancia):
+            marca = "❌ REGRESIÓN" if regresion else "✅"
+            print(f"{nombre:<34}{ms_base:>10.3f} → {ms_actual:>10.3f} ms  {cambio:+7.1%}  {marca}")
+            regresiones += regresion
+        sys.exit(1 if regresiones else 0)
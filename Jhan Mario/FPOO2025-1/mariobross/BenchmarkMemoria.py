@@ -0,0 +1,102 @@
+# Mide memoria por instancia y velocidad de acceso a atributos de las clases
+# con __slots__ frente a una copia equivalente que guarda todo en __dict__.
+import os
+import sys
+import importlib
+import timeit
+import tracemalloc
+
+os.environ.setdefault("MARIO_HEADLESS", "1")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MARIO_DIR = os.path.join(os.path.dirname(BASE_DIR), "mario")
+
+N_INSTANCIAS = 20000
+
+
+class ConDict:
+    """Copia de una instancia con los mismos atributos pero guardados en __dict__ (el 'antes')"""
+    def __init__(self, plantilla):
+        for nombre in nombres_slots(type(plantilla)):
+            if hasattr(plantilla, nombre):
+                setattr(self, nombre, getattr(plantilla, nombre))
+
+
+def nombres_slots(clase):
+    nombres = []
+    for c in reversed(clase.__mro__):
+        nombres.extend(c.__dict__.get("__slots__", ()))
+    return nombres
+
+
+def cargar_modulo(directorio, nombre):
+    """Importa un módulo de un paquete plano; mario y mariobross comparten nombres de archivo"""
+    sys.path.insert(0, directorio)
+    try:
+        for conflicto in ("Personaje", "Poder"):
+            sys.modules.pop(conflicto, None)
+        return importlib.import_module(nombre)
+    finally:
+        sys.path.remove(directorio)
+
+
+def memoria_por_instancia(fabrica):
+    tracemalloc.start()
+    antes = tracemalloc.take_snapshot()
+    objetos = [fabrica() for _ in range(N_INSTANCIAS)]
+    despues = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in despues.compare_to(antes, "filename"))
+    del objetos
+    return total / N_INSTANCIAS
+
+
+def acceso_ns(obj, atributo, repeticiones=200000):
+    tiempo = timeit.timeit(f"obj.{atributo}", globals={"obj": obj}, number=repeticiones)
+    return tiempo / repeticiones * 1e9
+
+
+def medir(nombre, fabrica, atributo):
+    slotted = fabrica()
+    con_dict = ConDict(slotted)
+    return {
+        "clase": nombre,
+        "bytes_antes": memoria_por_instancia(lambda: ConDict(slotted)),
+        "bytes_despues": memoria_por_instancia(fabrica),
+        "ns_antes": acceso_ns(con_dict, atributo),
+        "ns_despues": acceso_ns(slotted, atributo),
+    }
+
+
+def casos():
+    poder = cargar_modulo(MARIO_DIR, "Poder")
+    personaje_mario = cargar_modulo(MARIO_DIR, "Personaje")
+    yield "mario.Poder", lambda: poder.Poder(1, "Poder", "desc", 1, 2, "activo"), "posicionX"
+    yield "mario.Hongo", lambda: poder.Hongo(1, "Hongo", "desc", 1, 2, "activo", "Rojo"), "tipo"
+    yield "mario.Planta", lambda: poder.Planta(1, "Planta", "desc", 1, 2, "activo"), "estado"
+    yield "mario.Personaje", lambda: personaje_mario.Personaje(1, "Goomba", 0, 0, "Vivo"), "posicionX"
+    yield "mario.Jugador", lambda: personaje_mario.Jugador(1, "Mario"), "vidas"
+
+    personaje_bross = cargar_modulo(BASE_DIR, "Personaje")
+    yield "mariobross.Personaje", lambda: personaje_bross.Personaje(1, "Luigi", 0, 0), "posicionX"
+    yield "mariobross.Jugador", lambda: personaje_bross.Jugador(1, "Mario"), "vidas"
+
+    try:
+        prueba = cargar_modulo(BASE_DIR, "Prueba")
+    except ImportError as e:
+        print(f"⚠️ Se omiten las clases de Prueba.py: {e}")
+        return
+    yield "Prueba.Jugador", prueba.Jugador, "x"
+    yield "Prueba.Goomba", prueba.Goomba, "x"
+    yield "Prueba.Tortuga", prueba.Tortuga, "x"
+    yield "Prueba.Moneda", lambda: prueba.Moneda(100, 450), "x"
+    yield "Prueba.Hongo", lambda: prueba.Hongo("vida", (100, 450)), "tiempo_visible"
+    yield "Prueba.Estrella", lambda: prueba.Estrella((100, 450)), "x"
+
+
+if __name__ == "__main__":
+    print(f"{'Clase':<22}{'bytes antes':>12}{'bytes después':>15}{'ns antes':>10}{'ns después':>12}")
+    for nombre, fabrica, atributo in casos():
+        r = medir(nombre, fabrica, atributo)
+        print(f"{r['clase']:<22}{r['bytes_antes']:>12.0f}{r['bytes_despues']:>15.0f}"
+              f"{r['ns_antes']:>10.1f}{r['ns_despues']:>12.1f}")
@@ -0,0 +1,200 @@
+# Cliente del servidor multijugador (Servidor.py).
+# EstadoRemoto aplica las instantáneas completas y los deltas; ClienteRed es la
+# conexión asyncio. GameRed es la ventana Tk de Game.py dibujando el estado que
+# manda el servidor (las teclas se envían en vez de mover al jugador local).
+#
+# Uso:
+#   python Cliente.py [sala] [puerto]                ventana Tk
+#   python Cliente.py --bots=N [--segundos=S] [sala] [puerto]   carga sin ventana
+import asyncio
+import random
+import sys
+import threading
+import time
+
+import Protocolo
+import Reglas
+
+PUERTO = 8765
+
+
+class JugadorRemoto:
+    __slots__ = [nombre for nombre, _ in Protocolo.CAMPOS] + ["id"]
+
+    def __init__(self, jid):
+        self.id = jid
+        for nombre, _ in Protocolo.CAMPOS:
+            setattr(self, nombre, 0)
+
+
+class EstadoRemoto:
+    def __init__(self):
+        self.tick = 0
+        self.jugadores = {}   # id -> JugadorRemoto
+        self.recogibles = {}  # id -> (tipo, x, y)
+        self.bytes_recibidos = 0
+        self.mensajes = 0
+
+    def aplicar(self, datos):
+        tick, completa, jugadores, salidos, recogibles, quitados = Protocolo.decodificar_instantanea(datos)
+        self.tick = tick
+        self.bytes_recibidos += len(datos) + Protocolo.LARGO.size
+        self.mensajes += 1
+        if completa:
+            self.jugadores.clear()
+            self.recogibles.clear()
+        for jid, campos in jugadores:
+            j = self.jugadores.get(jid)
+            if j is None:
+                j = self.jugadores[jid] = JugadorRemoto(jid)
+            for i, valor in campos.items():
+                setattr(j, Protocolo.CAMPOS[i][0], valor)
+        for jid in salidos:
+            self.jugadores.pop(jid, None)
+        for rid, tipo, x, y in recogibles:
+            self.recogibles[rid] = (tipo, x, y)
+        for rid in quitados:
+            self.recogibles.pop(rid, None)
+
+
+class ClienteRed:
+    def __init__(self, sala="principal", host="127.0.0.1", puerto=PUERTO):
+        self.sala = sala
+        self.host = host
+        self.puerto = puerto
+        self.estado = EstadoRemoto()
+        self.id = None
+        self.escritor = None
+
+    async def conectar(self):
+        lector, self.escritor = await asyncio.open_connection(self.host, self.puerto)
+        self.escritor.write(Protocolo.enmarcar(b"J" + self.sala.encode("utf-8")))
+        _, self.id = Protocolo.HOLA.unpack(await Protocolo.leer_mensaje(lector))
+        return lector
+
+    async def escuchar(self, lector, al_recibir=None):
+        try:
+            while True:
+                datos = await Protocolo.leer_mensaje(lector)
+                if datos[:1] == b"S":
+                    self.estado.aplicar(datos)
+                    if al_recibir:
+                        al_recibir()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    def tecla(self, tecla):
+        self.escritor.write(Protocolo.enmarcar(b"K" + bytes([Reglas.TECLAS.index(tecla)])))
+
+    def cerrar(self):
+        if self.escritor:
+            self.escritor.close()
+
+
+# --- Ventana Tk -------------------------------------------------------------
+
+def crear_game_red(cliente, bucle):
+    """Game de Tk que muestra el estado del servidor; se importa aquí para no pedir Tk a los bots"""
+    from Game import Game
+    from Personaje import Jugador
+
+    class GameRed(Game):
+        def start_game(self):
+            self.menu.destroy()
+            self.canvas.pack(pady=20)
+            self.recogibles_red = {}  # id -> canvas_id
+            self.root.after(Reglas.TICK_MS, self.tick)
+
+        def on_key(self, ev):
+            if ev.keysym in Reglas.TECLAS:
+                bucle.call_soon_threadsafe(cliente.tecla, ev.keysym)
+
+        def tick(self):
+            self.sincronizar()
+            self.render()
+            self.root.after(Reglas.TICK_MS, self.tick)
+
+        def sincronizar(self):
+            estado = cliente.estado
+            jugadores = dict(estado.jugadores)  # copia: el hilo de red sigue escribiendo
+            for p in list(self.players):
+                if p.id not in jugadores:
+                    self.quitar_jugador(p)
+            locales = {p.id: p for p in self.players}
+            for jid, remoto in jugadores.items():
+                p = locales.get(jid)
+                if p is None:
+                    p = Jugador(jid, f"Jugador{jid}", remoto.posicionX, remoto.posicionY)
+                    self.add_player(p, "inicial")
+                p.posicionX, p.posicionY = remoto.posicionX, remoto.posicionY
+                p.vidas, p.monedas, p.puntos, p.tiempo = remoto.vidas, remoto.monedas, remoto.puntos, remoto.tiempo
+                sprite = Reglas.SPRITES_JUGADOR[remoto.sprite]
+                if remoto.grande and sprite == "inicial":
+                    sprite = "inicialGrande"
+                self.player_state[jid].img_key = sprite
+
+            recogibles = dict(estado.recogibles)
+            for rid in list(self.recogibles_red):
+                if rid not in recogibles:
+                    self.canvas.delete(self.recogibles_red.pop(rid))
+            for rid, (tipo, x, y) in recogibles.items():
+                if rid not in self.recogibles_red:
+                    self.recogibles_red[rid] = self.canvas.create_image(x, y, image=self.imgs[tipo])
+
+        def quitar_jugador(self, p):
+            self.players.remove(p)
+            self.canvas.delete(p.canvas_id)
+            for tid in self.stats_texts.pop(p.id).values():
+                self.canvas.delete(tid)
+            del self.player_state[p.id]
+
+    return GameRed()
+
+
+def ventana(sala, puerto):
+    bucle = asyncio.new_event_loop()
+    cliente = ClienteRed(sala, puerto=puerto)
+
+    async def red():
+        lector = await cliente.conectar()
+        await cliente.escuchar(lector)
+
+    hilo = threading.Thread(target=bucle.run_until_complete, args=(red(),), daemon=True)
+    hilo.start()
+    crear_game_red(cliente, bucle).run()
+    bucle.call_soon_threadsafe(cliente.cerrar)
+
+
+# --- Bots de carga ----------------------------------------------------------
+
+async def bots(n, segundos, sala, puerto):
+    clientes = [ClienteRed(sala, puerto=puerto) for _ in range(n)]
+    lectores = [await c.conectar() for c in clientes]
+    tareas = [asyncio.ensure_future(c.escuchar(l)) for c, l in zip(clientes, lectores)]
+    rng = random.Random(0)
+    fin = time.monotonic() + segundos
+    while time.monotonic() < fin:
+        # Cada tick, un 5% de los bots aprieta una tecla
+        for c in clientes:
+            if rng.random() < 0.05:
+                c.tecla(rng.choice(Reglas.TECLAS))
+        await asyncio.sleep(Reglas.TICK_MS / 1000)
+    for c in clientes:
+        c.cerrar()
+    await asyncio.gather(*tareas)
+    total = sum(c.estado.bytes_recibidos for c in clientes)
+    mensajes = sum(c.estado.mensajes for c in clientes)
+    ticks = segundos * 1000 / Reglas.TICK_MS
+    print(f"{n} bots, {segundos} s: {total / n / ticks:.1f} bytes/tick por cliente, "
+          f"{mensajes / n / ticks:.2f} mensajes/tick por cliente")
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    opciones = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+    sala = args[0] if len(args) > 0 else "principal"
+    puerto = int(args[1]) if len(args) > 1 else PUERTO
+    if "bots" in opciones:
+        asyncio.run(bots(int(opciones["bots"]), float(opciones.get("segundos", 5)), sala, puerto))
+    else:
+        ventana(sala, puerto)
@@ -0,0 +1,64 @@
+# Broadphase de colisiones con una rejilla uniforme (spatial hash).
+# Cada entidad se guarda en las celdas que toca su rect; una consulta solo
+# revisa las entidades de las celdas vecinas en vez de toda la lista.
+
+TAM_CELDA = 64
+
+
+class RejillaEspacial:
+    def __init__(self, tam_celda=TAM_CELDA):
+        self.tam_celda = tam_celda
+        self.celdas = {}
+        # Contadores por frame para medir el ahorro del broadphase
+        self.pares_candidatos = 0
+        self.pares_probados = 0
+
+    def _celdas_de(self, x, y, ancho, alto):
+        t = self.tam_celda
+        x0, x1 = int(x // t), int((x + ancho) // t)
+        y0, y1 = int(y // t), int((y + alto) // t)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                yield cx, cy
+
+    def limpiar(self):
+        self.celdas.clear()
+
+    def reiniciar_contadores(self):
+        self.pares_candidatos = 0
+        self.pares_probados = 0
+
+    def insertar(self, obj):
+        for celda in self._celdas_de(*obj.rect):
+            self.celdas.setdefault(celda, []).append(obj)
+
+    def quitar(self, obj):
+        for celda in self._celdas_de(*obj.rect):
+            lista = self.celdas.get(celda)
+            if lista and obj in lista:
+                lista.remove(obj)
+
+    def reconstruir(self, objetos):
+        self.limpiar()
+        for obj in objetos:
+            self.insertar(obj)
+
+    def consultar(self, x, y, ancho, alto):
+        """Entidades (sin repetir) que comparten alguna celda con el rectángulo"""
+        vistos = set()
+        candidatos = []
+        for celda in self._celdas_de(x, y, ancho, alto):
+            for obj in self.celdas.get(celda, ()):
+                self.pares_candidatos += 1
+                if id(obj) not in vistos:
+                    vistos.add(id(obj))
+                    candidatos.append(obj)
+        return candidatos
+
+    def colisiones_con(self, otro):
+        """Entidades de la rejilla cuyo rect choca con el de otro.
+        Solo compara rects: no llama a colisiona_con, así que quien quite o desactive
+        una entidad debe sacarla de la rejilla (o revisar activo al recibirla)."""
+        candidatos = self.consultar(*otro.rect)
+        self.pares_probados += len(candidatos)
+        return [candidatos[i] for i in otro.rect.collidelistall(candidatos)]
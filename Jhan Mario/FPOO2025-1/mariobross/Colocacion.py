@@ -0,0 +1,54 @@
+# Colocación de monedas (u otros objetos cuadrados) sin superposiciones.
+# El área se divide en una rejilla de celdas un poco más grandes que el objeto;
+# se eligen al azar n celdas libres y cada objeto se desplaza al azar dentro
+# de su celda. Como cada objeto queda dentro de su propia celda nunca se
+# superponen, y el costo es O(n) sin reintentos: no hay muestreo por rechazo.
+import math
+
+
+def colocar_en_rejilla(rng, n, area, tam, separacion=0, excluir=()):
+    """Centros (x, y) enteros de hasta n objetos de tam x tam dentro de area.
+
+    area: (x_min, y_min, x_max, y_max) de los centros permitidos.
+    excluir: rectángulos (x, y, ancho, alto) que los objetos no deben tocar.
+    Si no hay suficientes celdas libres devuelve menos de n posiciones."""
+    x_min, y_min, x_max, y_max = area
+    mitad = tam / 2
+    # Caja que ocupan los objetos completos
+    izquierda, arriba = x_min - mitad, y_min - mitad
+    ancho_caja = x_max - x_min + tam
+    alto_caja = y_max - y_min + tam
+    paso = tam + separacion
+    columnas = max(1, int(ancho_caja // paso))
+    filas = max(1, int(alto_caja // paso))
+    if ancho_caja < tam or alto_caja < tam:
+        return []
+    ancho_celda = ancho_caja / columnas
+    alto_celda = alto_caja / filas
+
+    excluidas = set()
+    for ex, ey, ew, eh in excluir:
+        c0 = max(0, int((ex - izquierda) // ancho_celda))
+        c1 = min(columnas - 1, int(math.ceil((ex + ew - izquierda) / ancho_celda)) - 1)
+        f0 = max(0, int((ey - arriba) // alto_celda))
+        f1 = min(filas - 1, int(math.ceil((ey + eh - arriba) / alto_celda)) - 1)
+        for f in range(f0, f1 + 1):
+            for c in range(c0, c1 + 1):
+                excluidas.add(f * columnas + c)
+
+    total = columnas * filas
+    pedidas = min(total, n + len(excluidas))
+    celdas = [i for i in rng.sample(range(total), pedidas) if i not in excluidas][:n]
+
+    posiciones = []
+    for i in celdas:
+        f, c = divmod(i, columnas)
+        # Rango de la esquina superior izquierda que deja el objeto dentro de la celda
+        x0 = math.ceil(izquierda + c * ancho_celda)
+        x1 = math.floor(izquierda + (c + 1) * ancho_celda - tam)
+        y0 = math.ceil(arriba + f * alto_celda)
+        y1 = math.floor(arriba + (f + 1) * alto_celda - tam)
+        x = rng.randint(x0, max(x0, x1))
+        y = rng.randint(y0, max(y0, y1))
+        posiciones.append((x + int(mitad), y + int(mitad)))
+    return posiciones
@@ -0,0 +1,157 @@
+# Almacén de entidades en arreglos de NumPy (struct-of-arrays).
+# Guarda posiciones, tamaños, velocidades y banderas de todas las entidades
+# de un grupo para moverlas, descartarlas y chocarlas en lote.
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: sin él el juego usa las listas de objetos
+    np = None
+
+# Clases de entidad
+GOOMBA = 0
+TORTUGA = 1
+MONEDA = 2
+
+# Estados de tortuga
+NORMAL = 0
+DISPARADA = 1
+
+
+def numpy_disponible():
+    return np is not None
+
+
+class VistaEntidad:
+    """Vista liviana de una fila del almacén, con la misma forma que un Goomba o Tortuga"""
+    __slots__ = ("almacen", "indice")
+
+    def __init__(self, almacen, indice):
+        self.almacen = almacen
+        self.indice = indice
+
+    @property
+    def x(self):
+        return float(self.almacen.x[self.indice])
+
+    @property
+    def y(self):
+        return float(self.almacen.y[self.indice])
+
+    @property
+    def ancho(self):
+        return float(self.almacen.ancho[self.indice])
+
+    @property
+    def alto(self):
+        return float(self.almacen.alto[self.indice])
+
+
+class AlmacenEntidades:
+    def __init__(self, capacidad=64):
+        if np is None:
+            raise ImportError("AlmacenEntidades necesita numpy (pip install numpy)")
+        self.n = 0
+        self.x = np.zeros(capacidad, dtype=np.float64)
+        self.y = np.zeros(capacidad, dtype=np.float64)
+        self.ancho = np.zeros(capacidad, dtype=np.float64)
+        self.alto = np.zeros(capacidad, dtype=np.float64)
+        self.velocidad = np.zeros(capacidad, dtype=np.float64)
+        self.direccion = np.zeros(capacidad, dtype=np.float64)
+        self.activo = np.zeros(capacidad, dtype=bool)
+        self.clase = np.zeros(capacidad, dtype=np.int8)
+        self.tipo = np.zeros(capacidad, dtype=np.int8)
+        self.estado = np.zeros(capacidad, dtype=np.int8)
+
+    _COLUMNAS = ("x", "y", "ancho", "alto", "velocidad", "direccion", "activo", "clase", "tipo", "estado")
+
+    def __len__(self):
+        return self.n
+
+    def _crecer(self):
+        capacidad = len(self.x) * 2
+        for nombre in self._COLUMNAS:
+            viejo = getattr(self, nombre)
+            nuevo = np.zeros(capacidad, dtype=viejo.dtype)
+            nuevo[:self.n] = viejo[:self.n]
+            setattr(self, nombre, nuevo)
+
+    def agregar(self, clase, x, y, ancho, alto, velocidad=0, direccion=0, tipo=0, estado=0):
+        if self.n == len(self.x):
+            self._crecer()
+        i = self.n
+        self.x[i] = x
+        self.y[i] = y
+        self.ancho[i] = ancho
+        self.alto[i] = alto
+        self.velocidad[i] = velocidad
+        self.direccion[i] = direccion
+        self.activo[i] = True
+        self.clase[i] = clase
+        self.tipo[i] = tipo
+        self.estado[i] = estado
+        self.n += 1
+        return i
+
+    def limpiar(self):
+        self.n = 0
+
+    def activos(self):
+        return int(np.count_nonzero(self.activo[:self.n]))
+
+    def mover(self):
+        n = self.n
+        self.x[:n] += self.velocidad[:n] * self.direccion[:n]
+
+    def descartar_fuera(self, izquierda, derecha):
+        """Desactiva las entidades que salieron por completo de [izquierda, derecha]"""
+        n = self.n
+        fuera = (self.x[:n] + self.ancho[:n] < izquierda) | (self.x[:n] > derecha)
+        self.activo[:n] &= ~fuera
+
+    def mascara_colision(self, x, y, ancho, alto):
+        n = self.n
+        return (self.activo[:n] &
+                (self.x[:n] < x + ancho) & (self.x[:n] + self.ancho[:n] > x) &
+                (self.y[:n] < y + alto) & (self.y[:n] + self.alto[:n] > y))
+
+    def colisiones_con(self, x, y, ancho, alto):
+        """Índices de las entidades activas que se superponen con el rectángulo dado"""
+        return np.flatnonzero(self.mascara_colision(x, y, ancho, alto))
+
+    def colisiones_entre(self, indices_a, indices_b):
+        """Para cada índice de indices_b, indica si choca con alguno de indices_a"""
+        if len(indices_a) == 0 or len(indices_b) == 0:
+            return np.zeros(len(indices_b), dtype=bool)
+        xa = self.x[indices_a][:, None]
+        ya = self.y[indices_a][:, None]
+        wa = self.ancho[indices_a][:, None]
+        ha = self.alto[indices_a][:, None]
+        xb = self.x[indices_b][None, :]
+        yb = self.y[indices_b][None, :]
+        wb = self.ancho[indices_b][None, :]
+        hb = self.alto[indices_b][None, :]
+        choque = (xa < xb + wb) & (xa + wa > xb) & (ya < yb + hb) & (ya + ha > yb)
+        return choque.any(axis=0)
+
+    def indices(self, clase=None, estado=None):
+        n = self.n
+        mascara = self.activo[:n].copy()
+        if clase is not None:
+            mascara &= self.clase[:n] == clase
+        if estado is not None:
+            mascara &= self.estado[:n] == estado
+        return np.flatnonzero(mascara)
+
+    def compactar(self):
+        """Elimina las filas inactivas conservando el orden de las activas"""
+        n = self.n
+        vivos = self.activo[:n].copy()
+        k = int(np.count_nonzero(vivos))
+        if k == n:
+            return
+        for nombre in self._COLUMNAS:
+            columna = getattr(self, nombre)
+            columna[:k] = columna[:n][vivos]
+        self.n = k
+
+    def vista(self, indice):
+        return VistaEntidad(self, indice)
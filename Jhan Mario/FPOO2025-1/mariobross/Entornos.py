@@ -0,0 +1,249 @@
+# Lote de N partidas independientes de Prueba.Juego para entrenar y evaluar bots.
+# Cada partida usa exactamente las reglas de Juego.actualizar (sin ventana ni
+# audio); el lote recibe un arreglo de acciones y escribe observaciones,
+# recompensas y banderas de fin en arreglos de NumPy reservados una sola vez.
+# LoteParalelo reparte las partidas entre procesos que escriben directamente
+# en memoria compartida, así los pasos por segundo crecen con los núcleos.
+#
+# Acción: un entero por partida, bit 0 = izquierda, bit 1 = derecha, bit 2 = salto.
+# Recompensa: +1 por moneda recogida, +1/-1 por vida ganada/perdida.
+# Cuando una partida termina (game over o max_frames) se reinicia sola con la
+# siguiente semilla: su bandera de fin queda en True y la observación ya es la
+# de la partida nueva. La partida g usa las semillas semilla + g + k * N
+# (k = número de episodio), así el resultado no depende de cómo se reparta.
+#
+# Uso: python Entornos.py [entornos] [pasos] [--procesos=N]
+import os
+import sys
+import time
+import multiprocessing
+from multiprocessing import shared_memory
+
+os.environ.setdefault("MARIO_HEADLESS", "1")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional para el juego, pero el lote lo necesita
+    np = None
+
+from Repeticion import decodificar
+
+ENEMIGOS_OBSERVADOS = 4
+MONEDAS_OBSERVADAS = 3
+# jugador (x, y, alto, saltando, inmune, vidas, monedas) + (dx, dy, es_tortuga, disparada) por enemigo + (dx, dy) por moneda
+TAM_OBSERVACION = 7 + 4 * ENEMIGOS_OBSERVADOS + 2 * MONEDAS_OBSERVADAS
+MAX_FRAMES = 60 * 60
+
+
+class EntradaAccion:
+    """Entrada de Juego controlada desde afuera: devuelve la última acción asignada"""
+    __slots__ = ("accion",)
+
+    def __init__(self):
+        self.accion = (False, False, False)
+
+    def leer(self):
+        return self.accion
+
+
+def reservar(n):
+    """Arreglos del lote: (acciones, observaciones, recompensas, terminados)"""
+    return (np.zeros(n, dtype=np.uint8), np.zeros((n, TAM_OBSERVACION), dtype=np.float32),
+            np.zeros(n, dtype=np.float32), np.zeros(n, dtype=bool))
+
+
+class LoteJuegos:
+    def __init__(self, n, semilla=0, max_frames=MAX_FRAMES, arreglos=None, primero=0, total=None):
+        """primero y total: posición de estas partidas dentro del lote completo (para repartir en procesos)"""
+        if np is None:
+            raise ImportError("LoteJuegos necesita numpy (pip install numpy)")
+        from Prueba import Juego
+        self.Juego = Juego
+        self.n = n
+        self.semilla = semilla + primero
+        self.total = total or n
+        self.max_frames = max_frames
+        self.acciones, self.observaciones, self.recompensas, self.terminados = arreglos or reservar(n)
+        self.episodios = [0] * n
+        self.entradas = [EntradaAccion() for _ in range(n)]
+        self.juegos = [None] * n
+        self.frames = [0] * n
+        self.previos = [None] * n  # (vidas, monedas) del paso anterior
+
+    def _nuevo(self, i):
+        semilla = self.semilla + i + self.episodios[i] * self.total
+        self.episodios[i] += 1
+        juego = self.Juego(headless=True, entrada=self.entradas[i], semilla=semilla)
+        self.juegos[i] = juego
+        self.frames[i] = 0
+        self.previos[i] = (juego.jugador.vidas, juego.jugador.recogidas_monedas)
+
+    def reiniciar(self):
+        for i in range(self.n):
+            self._nuevo(i)
+            self.observar(i)
+        self.recompensas[:] = 0
+        self.terminados[:] = False
+        return self.observaciones
+
+    def paso(self, acciones=None):
+        """Avanza un frame en todas las partidas. Devuelve (observaciones, recompensas, terminados)."""
+        if acciones is not None:
+            self.acciones[:] = acciones
+        for i, juego in enumerate(self.juegos):
+            self.entradas[i].accion = decodificar(int(self.acciones[i]))
+            juego.aplicar_entrada()
+            juego.actualizar()
+            self.frames[i] += 1
+
+            jugador = juego.jugador
+            vidas_previas, monedas_previas = self.previos[i]
+            monedas = jugador.recogidas_monedas - monedas_previas
+            if monedas < 0:  # el contador vuelve a 0 al llegar a 10 monedas
+                monedas += 10
+            self.recompensas[i] = monedas + (jugador.vidas - vidas_previas)
+            self.previos[i] = (jugador.vidas, jugador.recogidas_monedas)
+
+            terminado = juego.juego_terminado or self.frames[i] >= self.max_frames
+            self.terminados[i] = terminado
+            if terminado:
+                self._nuevo(i)
+            self.observar(i)
+        return self.observaciones, self.recompensas, self.terminados
+
+    def observar(self, i):
+        juego = self.juegos[i]
+        j = juego.jugador
+        fila = self.observaciones[i]
+        fila[:7] = (j.x, j.y, j.alto, j.salto, j.inmunidad, j.vidas, j.recogidas_monedas)
+
+        enemigos = [(g.x - j.x, g.y - j.y, 0.0, 0.0) for g in juego.goombas]
+        enemigos += [(t.x - j.x, t.y - j.y, 1.0, float(t.estado == 'disparada')) for t in juego.tortugas]
+        enemigos.sort(key=lambda e: abs(e[0]))
+        k = 7
+        for e in enemigos[:ENEMIGOS_OBSERVADOS]:
+            fila[k:k + 4] = e
+            k += 4
+        fila[k:7 + 4 * ENEMIGOS_OBSERVADOS] = 0
+
+        monedas = sorted(((m.x - j.x, m.y - j.y) for m in juego.monedas), key=lambda m: abs(m[0]))
+        k = 7 + 4 * ENEMIGOS_OBSERVADOS
+        for m in monedas[:MONEDAS_OBSERVADAS]:
+            fila[k:k + 2] = m
+            k += 2
+        fila[k:] = 0
+
+
+# --- Procesos con memoria compartida -----------------------------------------
+
+def _arreglos_compartidos(bloques, n, desde=0, hasta=None):
+    """Vistas de los bloques de memoria compartida, opcionalmente solo las filas [desde, hasta)"""
+    hasta = n if hasta is None else hasta
+    acciones = np.ndarray((n,), dtype=np.uint8, buffer=bloques[0].buf)
+    observaciones = np.ndarray((n, TAM_OBSERVACION), dtype=np.float32, buffer=bloques[1].buf)
+    recompensas = np.ndarray((n,), dtype=np.float32, buffer=bloques[2].buf)
+    terminados = np.ndarray((n,), dtype=bool, buffer=bloques[3].buf)
+    return tuple(a[desde:hasta] for a in (acciones, observaciones, recompensas, terminados))
+
+
+def _trabajador(nombres, n, desde, hasta, semilla, max_frames, conexion):
+    bloques = [shared_memory.SharedMemory(name=nombre) for nombre in nombres]
+    lote = None
+    try:
+        lote = LoteJuegos(hasta - desde, semilla, max_frames,
+                          arreglos=_arreglos_compartidos(bloques, n, desde, hasta), primero=desde, total=n)
+        while True:
+            orden = conexion.recv()
+            if orden == "paso":
+                lote.paso()
+            elif orden == "reiniciar":
+                lote.reiniciar()
+            else:
+                break
+            conexion.send(True)
+    finally:
+        del lote
+        for bloque in bloques:
+            bloque.close()
+
+
+class LoteParalelo:
+    """Mismo uso que LoteJuegos, con las partidas repartidas entre `procesos` procesos"""
+    def __init__(self, n, procesos=None, semilla=0, max_frames=MAX_FRAMES):
+        if np is None:
+            raise ImportError("LoteParalelo necesita numpy (pip install numpy)")
+        procesos = max(1, min(n, procesos or os.cpu_count() or 1))
+        self.n = n
+        tamanos = (n, n * TAM_OBSERVACION * 4, n * 4, n)
+        self.bloques = [shared_memory.SharedMemory(create=True, size=max(1, t)) for t in tamanos]
+        self.acciones, self.observaciones, self.recompensas, self.terminados = _arreglos_compartidos(self.bloques, n)
+
+        contexto = multiprocessing.get_context("spawn")
+        self.conexiones = []
+        self.procesos = []
+        limites = [n * p // procesos for p in range(procesos + 1)]
+        for desde, hasta in zip(limites, limites[1:]):
+            propia, remota = contexto.Pipe()
+            proceso = contexto.Process(target=_trabajador, daemon=True,
+                                       args=([b.name for b in self.bloques], n, desde, hasta,
+                                             semilla, max_frames, remota))
+            proceso.start()
+            self.conexiones.append(propia)
+            self.procesos.append(proceso)
+
+    def _ordenar(self, orden):
+        for conexion in self.conexiones:
+            conexion.send(orden)
+        for conexion in self.conexiones:
+            conexion.recv()
+
+    def reiniciar(self):
+        self._ordenar("reiniciar")
+        return self.observaciones
+
+    def paso(self, acciones=None):
+        if acciones is not None:
+            self.acciones[:] = acciones
+        self._ordenar("paso")
+        return self.observaciones, self.recompensas, self.terminados
+
+    def cerrar(self):
+        for conexion in self.conexiones:
+            conexion.send("cerrar")
+        for proceso in self.procesos:
+            proceso.join()
+        # Soltar las vistas antes de cerrar la memoria compartida
+        self.acciones = self.observaciones = self.recompensas = self.terminados = None
+        for bloque in self.bloques:
+            bloque.close()
+            bloque.unlink()
+        self.bloques = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def medir(lote, pasos, semilla=0):
+    rng = np.random.default_rng(semilla)
+    acciones = rng.integers(0, 8, size=(pasos, lote.n), dtype=np.uint8)
+    lote.reiniciar()
+    inicio = time.perf_counter()
+    for t in range(pasos):
+        lote.paso(acciones[t])
+    return lote.n * pasos / (time.perf_counter() - inicio)
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    opciones = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+    n = int(args[0]) if len(args) > 0 else 64
+    pasos = int(args[1]) if len(args) > 1 else 1000
+    procesos = int(opciones.get("procesos", os.cpu_count() or 1))
+
+    print(f"1 proceso: {medir(LoteJuegos(n), pasos):,.0f} pasos/s")
+    with LoteParalelo(n, procesos) as lote:
+        print(f"{len(lote.procesos)} procesos: {medir(lote, pasos):,.0f} pasos/s")
@@ -3,13 +3,36 @@ import random
 import tkinter as tk # pygame
 from PIL import Image, ImageTk
 from Personaje import Jugador
+from Objetos import Recogible, IndiceRecogibles
+from Recursos import AtlasSprites, escalar_pil
+import Reglas
+from Reglas import TICK_MS, PICKUP_RADIO  # constantes compartidas con Servidor.py
+
+SPRITES = {
+    "inicial": ("1.png", (50, 50)),
+    "inicialGrande": ("1.png", (60, 60)),
+    "inicialI": ("1i.png", (50, 50)),
+    "izquierda": ("2i.png", (50, 50)),
+    "derecha": ("2.png", (50, 50)),
+    "hongoVerde": ("hongoVerde.png", (40, 40)),
+    "hongoRojo": ("hongoRojo.png", (40, 40)),
+}
+
+class PlayerState:
+    """Estado de animación de un jugador y lo último que se envió al canvas"""
+    __slots__ = ("dx", "jump_step", "img_key", "idle_key", "img_ticks",
+                 "drawn_pos", "drawn_img", "drawn_texts")
+
+    def __init__(self, img_key):
+        self.dx = 0
+        self.jump_step = 0          # 0 = en el piso; 1..JUMP_STEPS sube; luego baja
+        self.img_key = img_key
+        self.idle_key = img_key
+        self.img_ticks = 0
+        self.drawn_pos = None
+        self.drawn_img = None
+        self.drawn_texts = {}
 
-# Constantes
-PASO_X      = 10
-JUMP_HEIGHT = 100
-JUMP_STEPS  = 10
-
-ASSETS_DIR = "assets/images/"
 
 class Game:
     def __init__(self):
@@ -23,7 +46,7 @@ class Game:
         self.menu.pack(fill="both", expand=True)
 
         # Preparo canvas, pero lo mostraré en start_game()
-        self.ancho = 800; self.alto = 400
+        self.ancho = Reglas.ANCHO; self.alto = Reglas.ALTO
         self.canvas = tk.Canvas(self.root, width=self.ancho, height=self.alto, bg="white")
 
         # Cargo sprites
@@ -33,28 +56,25 @@ class Game:
         # Lista de jugadores y sus textos de stats
         self.players = []
         self.stats_texts = {}
+        self.player_state = {}
+
+        # Recogibles con posición en Python, indexados por celda
+        self.pickups = IndiceRecogibles()
+        self.pickup_effects = {
+            "hongoRojo": self.crecer_personaje,
+            "hongoVerde": self.vida_extra,
+        }
 
         # Teclado
         self.root.bind("<Key>", self.on_key)
 
     def load_images(self):
-
-        inicial   = Image.open(ASSETS_DIR+"1.png").resize((50,50))
-        inicialGrande = Image.open(ASSETS_DIR+"1.png").resize((60,60))
-        base_i = Image.open(ASSETS_DIR+"1i.png").resize((50,50))
-        izq    = Image.open(ASSETS_DIR+"2i.png").resize((50,50))
-        der    = Image.open(ASSETS_DIR+"2.png").resize((50,50))
-        hongoVerde = Image.open(ASSETS_DIR+"hongoVerde.png").resize((40, 40))
-        hongoRojo = Image.open(ASSETS_DIR+"hongoRojo.png").resize((40, 40))
-        
-        
-        self.imgs["inicial"]  = ImageTk.PhotoImage(inicial)
-        self.imgs["inicialGrande"]  = ImageTk.PhotoImage(inicialGrande)
-        self.imgs["inicialI"] = ImageTk.PhotoImage(base_i)
-        self.imgs["izquierda"]= ImageTk.PhotoImage(izq)
-        self.imgs["derecha"]  = ImageTk.PhotoImage(der)
-        self.imgs["hongoVerde"] = ImageTk.PhotoImage(hongoVerde)
-        self.imgs["hongoRojo"] = ImageTk.PhotoImage(hongoRojo)
+        # Sprites ya escalados desde el atlas en caché (compartido con Prueba.py)
+        atlas = AtlasSprites("tk", SPRITES, escalar_pil)
+        for clave in SPRITES:
+            datos, tamano = atlas.rgba(clave)
+            img = Image.frombuffer("RGBA", tamano, bytes(datos), "raw", "RGBA", 0, 1)
+            self.imgs[clave] = ImageTk.PhotoImage(img)
 
 
     def start_game(self):
@@ -66,96 +86,95 @@ class Game:
         self.add_player(p1, "inicial")
         #Calcular random posicion para el hongo entre 0  y 800
         posicionX = random.randint(0, self.ancho-40)
-        self.hongoRojo = self.canvas.create_image(posicionX, self.alto // 2, image=self.imgs["hongoRojo"])
+        self.add_pickup("hongoRojo", posicionX, self.alto // 2)
 
         posicionX = random.randint(0, self.ancho-40)
-        self.hongoVerde = self.canvas.create_image(posicionX, self.alto // 2, image=self.imgs["hongoVerde"])
+        self.add_pickup("hongoVerde", posicionX, self.alto // 2)
+
+        self.root.after(TICK_MS, self.tick)
+
+    def add_pickup(self, tipo, x, y):
+        obj = Recogible(tipo, x, y)
+        obj.canvas_id = self.canvas.create_image(x, y, image=self.imgs[tipo])
+        self.pickups.agregar(obj)
+        return obj
 
     def add_player(self, p, img_key):
         # sprite
         pid = self.canvas.create_image(p.posicionX, p.posicionY, image=self.imgs[img_key])
         p.canvas_id = pid
         self.players.append(p)
+        st = PlayerState(img_key)
+        st.drawn_pos = (p.posicionX, p.posicionY)
+        st.drawn_img = self.imgs[img_key]
+        self.player_state[p.id] = st
 
         # stats
         txts = {}
         x0 = 10 + (p.id-1)*150
         for i, attr in enumerate(("posicionX","posicionY","vidas","monedas","puntos","tiempo")):
-            txts[attr] = self.canvas.create_text(
-                x0, 10 + i*20, anchor="nw",
-                text=f"{attr}: {getattr(p,attr)}"
-            )
+            text = f"{attr}: {getattr(p,attr)}"
+            txts[attr] = self.canvas.create_text(x0, 10 + i*20, anchor="nw", text=text)
+            st.drawn_texts[attr] = text
         self.stats_texts[p.id] = txts
 
     def update_stats(self, p):
+        # Solo se reconfiguran los textos cuyo valor cambió
+        st = self.player_state[p.id]
         for attr, tid in self.stats_texts[p.id].items():
-            self.canvas.itemconfig(tid, text=f"{attr}: {getattr(p,attr)}")
+            text = f"{attr}: {getattr(p,attr)}"
+            if st.drawn_texts.get(attr) != text:
+                self.canvas.itemconfig(tid, text=text)
+                st.drawn_texts[attr] = text
 
     def on_key(self, ev):
+        # Las teclas solo anotan intenciones; el movimiento lo aplica tick()
         if not self.players: return
         p = self.players[0]
-        k = ev.keysym
-        if k == "Right":
-            self.canvas.itemconfig(p.canvas_id, image=self.imgs["derecha"])
-            p.mover(dx=PASO_X)
-            self.canvas.move(p.canvas_id, PASO_X, 0)
-            
-            self.root.after(100, lambda:
-               self.canvas.itemconfig(p.canvas_id, image=self.imgs["inicial"])
-            )
-        elif k == "Left":
-            self.canvas.itemconfig(p.canvas_id, image=self.imgs["izquierda"])
-            p.mover(dx=-PASO_X)
-            self.canvas.move(p.canvas_id, -PASO_X, 0)
-            self.root.after(100, lambda:
-                self.canvas.itemconfig(p.canvas_id, image=self.imgs["inicialI"])
-            )
-        elif k == "Up":
+        if ev.keysym == "Up":
             self.jump(p)
-        self.update_stats(p)
-        self.check_collisions(p)
+        else:
+            Reglas.aplicar_tecla(self.player_state[p.id], ev.keysym)
+
+    def tick(self):
+        for p in self.players:
+            dx, dy = Reglas.avanzar(self.player_state[p.id])
+            if dx or dy:
+                p.mover(dx=dx, dy=dy)
+                self.check_collisions(p)
+        self.render()
+        self.root.after(TICK_MS, self.tick)
+
+    def render(self):
+        # Empuja al canvas solo los ítems que cambiaron desde el último tick
+        for p in self.players:
+            st = self.player_state[p.id]
+            pos = (p.posicionX, p.posicionY)
+            if pos != st.drawn_pos:
+                self.canvas.coords(p.canvas_id, *pos)
+                st.drawn_pos = pos
+            img = self.imgs[st.img_key]
+            if img is not st.drawn_img:
+                self.canvas.itemconfig(p.canvas_id, image=img)
+                st.drawn_img = img
+            self.update_stats(p)
 
     def check_collisions(self, p):
-        coords_p = self.canvas.coords(p.canvas_id)
-        # Verifico si el personaje colisiona con el hongo verde        
-        if hasattr(self, "hongoRojo"):
-            coords_h = self.canvas.coords(self.hongoRojo)
-            if abs(coords_p[0] - coords_h[0]) < 30 and abs(coords_p[1] - coords_h[1]) < 30:
-                self.canvas.delete(self.hongoRojo)
-                del self.hongoRojo
-                self.crecer_personaje(p)
-        if hasattr(self, "hongoVerde"):
-            coords_h = self.canvas.coords(self.hongoVerde)
-            if abs(coords_p[0] - coords_h[0]) < 30 and abs(coords_p[1] - coords_h[1]) < 30:
-                self.canvas.delete(self.hongoVerde)
-                del self.hongoVerde
-                p.vidas += 1
-                self.update_stats(p)
-
-            #self.show_message("¡Comiste hongo de crecimiento!")
-
-        
+        # Posiciones desde Python: el canvas solo se toca para borrar lo recogido
+        for obj in self.pickups.cercanos(p.posicionX, p.posicionY, PICKUP_RADIO):
+            self.pickups.quitar(obj)
+            self.canvas.delete(obj.canvas_id)
+            self.pickup_effects[obj.tipo](p)
 
     def jump(self, p):
-        paso = JUMP_HEIGHT // JUMP_STEPS
-        def subir(i=0):
-            if i < JUMP_STEPS:
-                p.mover(dy=-paso)
-                self.canvas.move(p.canvas_id, 0, -paso)
-                self.update_stats(p)
-                self.root.after(20, lambda: subir(i+1))
-            else:
-                bajar()
-        def bajar(i=0):
-            if i < JUMP_STEPS:
-                p.mover(dy=paso)
-                self.canvas.move(p.canvas_id, 0, paso)
-                self.update_stats(p)
-                self.root.after(20, lambda: bajar(i+1))
-        subir()
+        Reglas.aplicar_tecla(self.player_state[p.id], "Up")
 
     def crecer_personaje(self, p):
         self.imgs["inicial"]   = self.imgs["inicialGrande"] 
+
+    def vida_extra(self, p):
+        p.vidas += 1
+
     def run(self):
         self.root.mainloop()
  
\ No newline at end of file
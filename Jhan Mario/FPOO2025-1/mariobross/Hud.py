@@ -0,0 +1,58 @@
+# Textos del HUD con caché: las etiquetas se rasterizan una sola vez y los
+# números se arman con glifos de dígitos ya renderizados. Cada contador guarda
+# su última superficie y solo se vuelve a armar cuando cambia el valor.
+import pygame
+
+DIGITOS = "0123456789-"
+
+
+class CacheTexto:
+    """Superficies de texto renderizadas, guardadas por cadena"""
+    def __init__(self, fuente, color, limite=256):
+        self.fuente = fuente
+        self.color = color
+        self.limite = limite
+        self.superficies = {}
+
+    def render(self, texto):
+        superficie = self.superficies.get(texto)
+        if superficie is None:
+            if len(self.superficies) >= self.limite:
+                self.superficies.clear()
+            superficie = self.fuente.render(texto, True, self.color)
+            self.superficies[texto] = superficie
+        return superficie
+
+
+class ContadorGlifos:
+    """Arma números a partir de los glifos de cada dígito"""
+    def __init__(self, fuente, color):
+        self.glifos = {c: fuente.render(c, True, color) for c in DIGITOS}
+        self.alto = max(g.get_height() for g in self.glifos.values())
+
+    def componer(self, etiqueta, valor):
+        """Superficie con la etiqueta ya renderizada seguida del número"""
+        glifos = [self.glifos[c] for c in str(valor)]
+        ancho = etiqueta.get_width() + sum(g.get_width() for g in glifos)
+        superficie = pygame.Surface((ancho, max(self.alto, etiqueta.get_height())), pygame.SRCALPHA)
+        superficie.blit(etiqueta, (0, 0))
+        x = etiqueta.get_width()
+        for g in glifos:
+            superficie.blit(g, (x, 0))
+            x += g.get_width()
+        return superficie
+
+
+class CapaHud:
+    def __init__(self, fuente, color):
+        self.textos = CacheTexto(fuente, color)
+        self.glifos = ContadorGlifos(fuente, color)
+        self.contadores = {}  # etiqueta -> (valor, superficie)
+
+    def contador(self, etiqueta, valor):
+        previo = self.contadores.get(etiqueta)
+        if previo is not None and previo[0] == valor:
+            return previo[1]
+        superficie = self.glifos.componer(self.textos.render(etiqueta), valor)
+        self.contadores[etiqueta] = (valor, superficie)
+        return superficie
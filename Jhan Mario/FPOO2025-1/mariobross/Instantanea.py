@@ -0,0 +1,226 @@
+# Instantáneas del estado de Prueba.Juego en un registro binario de tamaño fijo.
+# Sirven para volver atrás (Rebobinado: un búfer circular preasignado con los
+# últimos pasos) y para retomar una partida larga después de un cierre
+# inesperado (puntos de control en disco). Guardar y restaurar escriben y leen
+# con struct directamente sobre un bytearray, sin armar objetos intermedios,
+# así se puede hacer en cada paso.
+#
+# Registro (todo little-endian, siempre TAMANO bytes):
+#   jugador | hongo de crecimiento | hongo de vida | juego | generador aleatorio
+#   | CAPACIDAD_GOOMBAS goombas | CAPACIDAD_TORTUGAS tortugas | CAPACIDAD_MONEDAS monedas
+# Las entidades se guardan en el orden del pool (importa para las colisiones);
+# los lugares sobrantes quedan sin usar.
+#
+# Punto de control (.snap):  "MSNP" | versión (B) | semilla (q) | crc32 (I) | registro
+#
+# No se guarda el mundo desplazable ni el almacén de numpy (igual que la grabación).
+import os
+import struct
+import zlib
+
+LIMITE_INFERIOR = 500  # mismo piso que Prueba.py
+CAPACIDAD_GOOMBAS = 32
+CAPACIDAD_TORTUGAS = 32
+CAPACIDAD_MONEDAS = 64
+
+# x, y, alto, grande, vidas, salto, contador_salto, inmunidad, tiempo_inmunidad, recogidas_monedas
+JUGADOR = struct.Struct("<idH?I?h?dH")
+# x, activo, tiempo_visible
+HONGO = struct.Struct("<i?d")
+# estrella activa, enemigos creados, tiempo desde el último enemigo, terminado, cantidad de goombas/tortugas/monedas
+JUEGO = struct.Struct("<?Id?HHH")
+# 624 palabras del Mersenne Twister + posición, y el gauss guardado (si hay)
+RNG = struct.Struct("<625I")
+GAUSS = struct.Struct("<?d")
+# Bit i encendido: el i-ésimo campo guardado como double era un int (ver _campos_double);
+# así al restaurar vuelve el mismo tipo y suma_estado da el mismo hash
+ENTEROS = struct.Struct("<B")
+# x, café, activo
+GOOMBA = struct.Struct("<i??")
+# x, estado, dirección, activo
+TORTUGA = struct.Struct("<iBb?")
+# x, y, recogida, activo
+MONEDA = struct.Struct("<ii??")
+
+ESTADOS_TORTUGA = ("normal", "caparazon", "disparada")
+
+_HONGO_CRECIMIENTO = JUGADOR.size
+_HONGO_VIDA = _HONGO_CRECIMIENTO + HONGO.size
+_JUEGO = _HONGO_VIDA + HONGO.size
+_RNG = _JUEGO + JUEGO.size
+_GAUSS = _RNG + RNG.size
+_ENTEROS = _GAUSS + GAUSS.size
+_GOOMBAS = _ENTEROS + ENTEROS.size
+_TORTUGAS = _GOOMBAS + GOOMBA.size * CAPACIDAD_GOOMBAS
+_MONEDAS = _TORTUGAS + TORTUGA.size * CAPACIDAD_TORTUGAS
+TAMANO = _MONEDAS + MONEDA.size * CAPACIDAD_MONEDAS
+
+MAGIA = b"MSNP"
+VERSION_INSTANTANEA = 2
+CABECERA = struct.Struct("<4sBqI")
+
+
+def comprobar(juego):
+    if juego.mundo or juego.usar_almacen:
+        raise ValueError("Las instantáneas no guardan el mundo desplazable ni el almacén de numpy")
+
+
+def _campos_double(juego):
+    """Campos que empiezan como int y pasan a float al restarles tiempo o al saltar"""
+    return (juego.jugador.y, juego.jugador.tiempo_inmunidad, juego.hongo_crecimiento.tiempo_visible,
+            juego.hongo_vida.tiempo_visible, juego.tiempo_desde_ultimo_enemigo)
+
+
+def _entero_si(valor, bit, enteros):
+    return int(valor) if enteros & bit else valor
+
+
+def guardar_estado(juego, buf, offset=0):
+    """Escribe el estado de la simulación en buf[offset:offset + TAMANO]"""
+    j = juego.jugador
+    goombas, tortugas, monedas = juego.goombas.activos, juego.tortugas.activos, juego.monedas.activos
+    if (len(goombas) > CAPACIDAD_GOOMBAS or len(tortugas) > CAPACIDAD_TORTUGAS
+            or len(monedas) > CAPACIDAD_MONEDAS):
+        raise ValueError("Hay más entidades de las que caben en una instantánea")
+
+    JUGADOR.pack_into(buf, offset, j.x, j.y, j.alto, j.estado == 'grande', j.vidas, j.salto,
+                      j.contador_salto, j.inmunidad, j.tiempo_inmunidad, j.recogidas_monedas)
+    for pos, h in ((_HONGO_CRECIMIENTO, juego.hongo_crecimiento), (_HONGO_VIDA, juego.hongo_vida)):
+        HONGO.pack_into(buf, offset + pos, h.x, h.activo, h.tiempo_visible)
+    JUEGO.pack_into(buf, offset + _JUEGO, juego.estrella.activo, juego.enemigos_creados_total,
+                    juego.tiempo_desde_ultimo_enemigo, juego.juego_terminado,
+                    len(goombas), len(tortugas), len(monedas))
+    _, palabras, gauss = juego.rng.getstate()
+    RNG.pack_into(buf, offset + _RNG, *palabras)
+    GAUSS.pack_into(buf, offset + _GAUSS, gauss is not None, gauss or 0.0)
+    enteros = 0
+    for i, valor in enumerate(_campos_double(juego)):
+        if type(valor) is int:
+            enteros |= 1 << i
+    ENTEROS.pack_into(buf, offset + _ENTEROS, enteros)
+
+    pos = offset + _GOOMBAS
+    for g in goombas:
+        GOOMBA.pack_into(buf, pos, g.x, g.tipo == 'café', g.activo)
+        pos += GOOMBA.size
+    pos = offset + _TORTUGAS
+    for t in tortugas:
+        TORTUGA.pack_into(buf, pos, t.x, ESTADOS_TORTUGA.index(t.estado), t.direccion, t.activo)
+        pos += TORTUGA.size
+    pos = offset + _MONEDAS
+    for m in monedas:
+        MONEDA.pack_into(buf, pos, m.x, m.y, m.ya_recogida, m.activo)
+        pos += MONEDA.size
+
+
+def restaurar_estado(juego, buf, offset=0):
+    """Deja el juego exactamente como estaba cuando se guardó buf[offset:offset + TAMANO]"""
+    j = juego.jugador
+    enteros, = ENTEROS.unpack_from(buf, offset + _ENTEROS)
+    (j.x, j.y, j.alto, grande, j.vidas, j.salto, j.contador_salto,
+     j.inmunidad, j.tiempo_inmunidad, j.recogidas_monedas) = JUGADOR.unpack_from(buf, offset)
+    j.estado = 'grande' if grande else 'pequeño'
+    j.y = _entero_si(j.y, 1, enteros)
+    j.tiempo_inmunidad = _entero_si(j.tiempo_inmunidad, 2, enteros)
+    j.actualizar_rect()
+    for pos, h, bit in ((_HONGO_CRECIMIENTO, juego.hongo_crecimiento, 4), (_HONGO_VIDA, juego.hongo_vida, 8)):
+        h.x, h.activo, tiempo = HONGO.unpack_from(buf, offset + pos)
+        h.tiempo_visible = _entero_si(tiempo, bit, enteros)
+        h.rect.x = h.x - 15
+    (juego.estrella.activo, juego.enemigos_creados_total, tiempo,
+     juego.juego_terminado, n_goombas, n_tortugas, n_monedas) = JUEGO.unpack_from(buf, offset + _JUEGO)
+    juego.tiempo_desde_ultimo_enemigo = _entero_si(tiempo, 16, enteros)
+    hay_gauss, gauss = GAUSS.unpack_from(buf, offset + _GAUSS)
+    juego.rng.setstate((3, RNG.unpack_from(buf, offset + _RNG), gauss if hay_gauss else None))
+
+    # Los pools se ajustan a la cantidad guardada reutilizando las instancias que ya tienen
+    juego.goombas.fijar_cantidad(n_goombas)
+    pos = offset + _GOOMBAS
+    for g in juego.goombas.activos:
+        g.x, cafe, g.activo = GOOMBA.unpack_from(buf, pos)
+        g.tipo = 'café' if cafe else 'negro'
+        g.rect.update(g.x, g.y, g.ancho, g.alto)
+        pos += GOOMBA.size
+
+    juego.tortugas.fijar_cantidad(n_tortugas)
+    pos = offset + _TORTUGAS
+    for t in juego.tortugas.activos:
+        t.x, estado, t.direccion, t.activo = TORTUGA.unpack_from(buf, pos)
+        t.estado = ESTADOS_TORTUGA[estado]
+        t.alto = 40 if t.estado == 'normal' else 30
+        t.y = LIMITE_INFERIOR - t.alto
+        t.limite = juego.limite_mundo
+        t.rect.update(t.x, t.y, t.ancho, t.alto)
+        pos += TORTUGA.size
+
+    juego.monedas.fijar_cantidad(n_monedas)
+    pos = offset + _MONEDAS
+    for m in juego.monedas.activos:
+        m.x, m.y, m.ya_recogida, m.activo = MONEDA.unpack_from(buf, pos)
+        m.clave = None
+        m.rect.update(m.x - 15, m.y - 15, 30, 30)
+        pos += MONEDA.size
+    juego.rejilla_monedas.reconstruir(juego.monedas.activos)
+    juego.posiciones_previas = []  # no interpolar desde posiciones de otro momento
+
+
+class Rebobinado:
+    """Búfer circular con los últimos `capacidad` estados, reservado una sola vez"""
+    def __init__(self, juego, capacidad):
+        comprobar(juego)
+        self.juego = juego
+        self.capacidad = capacidad
+        self.buf = bytearray(TAMANO * capacidad)
+        self.siguiente = 0  # lugar donde se escribe el próximo estado
+        self.cantidad = 0
+
+    def __len__(self):
+        return self.cantidad
+
+    def guardar(self):
+        guardar_estado(self.juego, self.buf, self.siguiente * TAMANO)
+        self.siguiente = (self.siguiente + 1) % self.capacidad
+        self.cantidad = min(self.cantidad + 1, self.capacidad)
+
+    def retroceder(self, pasos=1):
+        """Vuelve al estado guardado `pasos` guardados atrás y descarta ese y los posteriores.
+        Devuelve False si no hay tantos estados guardados."""
+        if pasos < 1 or pasos > self.cantidad:
+            return False
+        self.siguiente = (self.siguiente - pasos) % self.capacidad
+        self.cantidad -= pasos
+        restaurar_estado(self.juego, self.buf, self.siguiente * TAMANO)
+        return True
+
+    def vaciar(self):
+        self.siguiente = 0
+        self.cantidad = 0
+
+
+def guardar_punto(ruta, juego):
+    """Punto de control en disco; se escribe en un temporal y se reemplaza de una vez"""
+    comprobar(juego)
+    registro = bytearray(TAMANO)
+    guardar_estado(juego, registro)
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as f:
+        f.write(CABECERA.pack(MAGIA, VERSION_INSTANTANEA, juego.semilla, zlib.crc32(registro)))
+        f.write(registro)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, ruta)
+
+
+def cargar_punto(ruta, juego):
+    """Restaura el juego desde un punto de control guardado con guardar_punto"""
+    comprobar(juego)
+    with open(ruta, "rb") as f:
+        contenido = f.read()
+    magia, version, semilla, crc = CABECERA.unpack_from(contenido, 0)
+    registro = memoryview(contenido)[CABECERA.size:]
+    if magia != MAGIA or version != VERSION_INSTANTANEA or len(registro) != TAMANO:
+        raise ValueError(f"{ruta} no es un punto de control válido")
+    if zlib.crc32(registro) != crc:
+        raise ValueError(f"{ruta} está dañado (crc distinto)")
+    juego.semilla = semilla
+    restaurar_estado(juego, registro)
@@ -0,0 +1,153 @@
+# Mundo con desplazamiento horizontal dividido en tramos (chunks) de ancho fijo.
+# Cada tramo se lee de su propio archivo del nivel cuando la cámara se acerca y
+# se descarta cuando queda atrás, así un nivel largo ocupa en memoria y en
+# tiempo por frame lo mismo que una sola pantalla.
+#
+# Un nivel es una carpeta con un archivo JSON por tramo (0000.json, 0001.json...):
+#   {"monedas": [[x, y], ...], "goombas": [x, ...], "tortugas": [x, ...]}
+# con x relativa al inicio del tramo. Sin carpeta se puede usar FuenteAleatoria,
+# que genera tramos sin fin a partir de una semilla.
+#
+# Generar un nivel:  python Mundo.py carpeta_destino [tramos] [semilla]
+import json
+import os
+import random
+import sys
+
+from Colocacion import colocar_en_rejilla
+
+ANCHO_CHUNK = 400
+LIMITE_INFERIOR = 500  # mismo piso que Prueba.py
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+NIVELES_DIR = os.path.join(BASE_DIR, "assets", "niveles")
+
+
+class FuenteNivel:
+    """Tramos leídos de los archivos de una carpeta de nivel"""
+    def __init__(self, directorio):
+        self.directorio = directorio
+        # Solo se cuentan los archivos; el contenido se lee al cargar cada tramo
+        self.total = sum(1 for n in os.listdir(directorio) if n.endswith(".json"))
+
+    def cargar(self, indice):
+        with open(os.path.join(self.directorio, f"{indice:04d}.json"), encoding="utf-8") as f:
+            return json.load(f)
+
+
+class FuenteAleatoria:
+    """Tramos generados sin fin; el mismo índice y semilla dan siempre el mismo tramo"""
+    total = None
+
+    def __init__(self, semilla=0):
+        self.semilla = semilla
+
+    def cargar(self, indice):
+        return generar_tramo(random.Random(self.semilla * 1000003 + indice), indice)
+
+
+def generar_tramo(rng, indice):
+    area = (20, LIMITE_INFERIOR - 60, ANCHO_CHUNK - 20, LIMITE_INFERIOR - 20)
+    monedas = [list(p) for p in colocar_en_rejilla(rng, rng.randint(1, 4), area, 30, separacion=4)]
+    if indice < 2:
+        # Sin enemigos cerca del punto de partida
+        return {"monedas": monedas, "goombas": [], "tortugas": []}
+    return {
+        "monedas": monedas,
+        "goombas": [rng.randint(0, ANCHO_CHUNK - 40) for _ in range(rng.randint(0, 2))],
+        "tortugas": [rng.randint(0, ANCHO_CHUNK - 40) for _ in range(rng.randint(0, 1))],
+    }
+
+
+def generar_nivel(directorio, tramos, semilla=0):
+    os.makedirs(directorio, exist_ok=True)
+    rng = random.Random(semilla)
+    for i in range(tramos):
+        with open(os.path.join(directorio, f"{i:04d}.json"), "w", encoding="utf-8") as f:
+            json.dump(generar_tramo(rng, i), f)
+
+
+class Camara:
+    def __init__(self, ancho_ventana):
+        self.ancho_ventana = ancho_ventana
+        self.x = 0
+
+    def seguir(self, x, ancho_mundo):
+        """El objetivo queda a un tercio de la pantalla, sin salirse del mundo"""
+        self.x = max(0, x - self.ancho_ventana // 3)
+        if ancho_mundo is not None:
+            self.x = min(self.x, max(0, ancho_mundo - self.ancho_ventana))
+
+    def visible(self, x, ancho):
+        return x + ancho > self.x and x < self.x + self.ancho_ventana
+
+
+class VistaCamara:
+    """Envuelve la pantalla: resta la posición de la cámara y no dibuja lo que queda fuera"""
+    def __init__(self, pantalla, camara):
+        self.pantalla = pantalla
+        self.camara = camara
+
+    def blit(self, img, pos, area=None):
+        x = pos[0] - self.camara.x
+        if x + img.get_width() <= 0 or x >= self.camara.ancho_ventana:
+            return None
+        return self.pantalla.blit(img, (x, pos[1]), area)
+
+
+class Mundo:
+    def __init__(self, fuente, ancho_ventana, margen=ANCHO_CHUNK):
+        self.fuente = fuente
+        self.camara = Camara(ancho_ventana)
+        self.margen = margen
+        self.cargados = {}  # índice -> datos del tramo
+        self.monedas_recogidas = set()  # (tramo, i): no vuelven a aparecer al recargar el tramo
+
+    @property
+    def ancho(self):
+        """Ancho total en píxeles, o None si el mundo no tiene fin"""
+        return None if self.fuente.total is None else self.fuente.total * ANCHO_CHUNK
+
+    def tramos_necesarios(self):
+        desde = max(0, int((self.camara.x - self.margen) // ANCHO_CHUNK))
+        hasta = int((self.camara.x + self.camara.ancho_ventana + self.margen) // ANCHO_CHUNK)
+        if self.fuente.total is not None:
+            hasta = min(hasta, self.fuente.total - 1)
+        return range(desde, hasta + 1)
+
+    def actualizar(self):
+        """Carga los tramos que se acercan y descarta los lejanos. Devuelve (nuevos, descartados)."""
+        necesarios = self.tramos_necesarios()
+        descartados = [i for i in self.cargados if i not in necesarios]
+        for i in descartados:
+            del self.cargados[i]
+        nuevos = []
+        for i in necesarios:
+            if i not in self.cargados:
+                self.cargados[i] = self.fuente.cargar(i)
+                nuevos.append(i)
+        return nuevos, descartados
+
+    def limites_cargados(self):
+        """[inicio, fin) en píxeles de la zona cargada"""
+        if not self.cargados:
+            return 0, 0
+        return min(self.cargados) * ANCHO_CHUNK, (max(self.cargados) + 1) * ANCHO_CHUNK
+
+    def entidades(self, indice):
+        """Monedas (con su clave), goombas y tortugas del tramo en coordenadas del mundo"""
+        datos = self.cargados[indice]
+        base = indice * ANCHO_CHUNK
+        monedas = [((indice, i), base + x, y) for i, (x, y) in enumerate(datos.get("monedas", ()))
+                   if (indice, i) not in self.monedas_recogidas]
+        goombas = [base + x for x in datos.get("goombas", ())]
+        tortugas = [base + x for x in datos.get("tortugas", ())]
+        return monedas, goombas, tortugas
+
+
+if __name__ == "__main__":
+    destino = sys.argv[1] if len(sys.argv) > 1 else os.path.join(NIVELES_DIR, "nivel1")
+    tramos = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    semilla = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    generar_nivel(destino, tramos, semilla)
+    print(f"✅ Nivel de {tramos} tramos guardado en {destino}")
@@ -0,0 +1,50 @@
+# Objetos que el jugador puede recoger en el juego Tk (hongos, monedas, ...).
+# Las posiciones viven en Python; el canvas solo se usa para dibujarlos.
+
+class Recogible:
+    __slots__ = ("tipo", "posicionX", "posicionY", "canvas_id")
+
+    def __init__(self, tipo, x, y, canvas_id=None):
+        self.tipo = tipo
+        self.posicionX = x
+        self.posicionY = y
+        self.canvas_id = canvas_id
+
+
+class IndiceRecogibles:
+    """Recogibles agrupados por celda para revisar solo los que están cerca del jugador"""
+    def __init__(self, tam_celda=64):
+        self.tam_celda = tam_celda
+        self.celdas = {}
+        self.total = 0
+
+    def __len__(self):
+        return self.total
+
+    def _celda(self, x, y):
+        return int(x // self.tam_celda), int(y // self.tam_celda)
+
+    def agregar(self, obj):
+        self.celdas.setdefault(self._celda(obj.posicionX, obj.posicionY), []).append(obj)
+        self.total += 1
+
+    def quitar(self, obj):
+        celda = self._celda(obj.posicionX, obj.posicionY)
+        lista = self.celdas.get(celda)
+        if lista and obj in lista:
+            lista.remove(obj)
+            self.total -= 1
+            if not lista:
+                del self.celdas[celda]
+
+    def cercanos(self, x, y, radio):
+        """Recogibles a menos de `radio` en X y en Y del punto (x, y)"""
+        cx0, cy0 = self._celda(x - radio, y - radio)
+        cx1, cy1 = self._celda(x + radio, y + radio)
+        resultado = []
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for obj in self.celdas.get((cx, cy), ()):
+                    if abs(x - obj.posicionX) < radio and abs(y - obj.posicionY) < radio:
+                        resultado.append(obj)
+        return resultado
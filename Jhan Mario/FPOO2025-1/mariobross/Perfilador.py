@@ -0,0 +1,193 @@
+# Medición del tiempo de cada fase del frame (eventos, actualizar, dibujar) y
+# de sus pasos internos (aparición, movimiento, cada pasada de colisiones,
+# monedas, hongos, HUD...). Guarda percentiles móviles e histogramas por
+# sección, puede dibujar un overlay en pantalla y exportar el trazo en el
+# formato JSON de Chrome (chrome://tracing o https://ui.perfetto.dev).
+#
+# Desactivado, el juego usa PERFIL_NULO: cada marca es una llamada vacía.
+#
+# Uso en el código:
+#   perf.comenzar_frame()
+#   perf.comenzar("actualizar")
+#   perf.paso("colisiones")   # cierra el paso anterior del mismo nivel
+#   perf.paso("monedas")
+#   perf.terminar()           # cierra el último paso y la fase
+#   perf.terminar_frame()
+import bisect
+import json
+import time
+from collections import deque
+
+# Límites superiores (ms) de las barras del histograma; la última barra es "más que eso"
+BORDES_MS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33)
+PERCENTILES = (50, 95, 99)
+
+
+class Estadistica:
+    """Últimas `capacidad` duraciones de una sección e histograma acumulado"""
+    __slots__ = ("duraciones", "histograma", "cuenta", "total_ms")
+
+    def __init__(self, capacidad):
+        self.duraciones = deque(maxlen=capacidad)
+        self.histograma = [0] * (len(BORDES_MS) + 1)
+        self.cuenta = 0
+        self.total_ms = 0.0
+
+    def agregar(self, ms):
+        self.duraciones.append(ms)
+        self.histograma[bisect.bisect_left(BORDES_MS, ms)] += 1
+        self.cuenta += 1
+        self.total_ms += ms
+
+    def percentiles(self):
+        """{50: ms, 95: ms, 99: ms, "max": ms} sobre la ventana móvil"""
+        ordenadas = sorted(self.duraciones)
+        if not ordenadas:
+            return {}
+        ultimo = len(ordenadas) - 1
+        resultado = {p: ordenadas[min(ultimo, int(p / 100 * len(ordenadas)))] for p in PERCENTILES}
+        resultado["max"] = ordenadas[-1]
+        return resultado
+
+
+class Perfilador:
+    activo = True
+
+    def __init__(self, capacidad=600, max_eventos=200000):
+        self.capacidad = capacidad
+        self.estadisticas = {}
+        self.eventos = deque(maxlen=max_eventos)
+        self.pila = []  # [nombre completo, inicio_ns, es_paso]
+        self.origen_ns = time.perf_counter_ns()
+        self.inicio_frame_ns = None
+        self.frames = 0
+        self.overlay_visible = False
+        self._overlay = None
+        self._fuente = None
+
+    # --- Marcas ---------------------------------------------------------------
+
+    def comenzar(self, nombre):
+        if self.pila:
+            nombre = f"{self.pila[-1][0]}/{nombre}"
+        self.pila.append([nombre, time.perf_counter_ns(), False])
+
+    def paso(self, nombre):
+        if self.pila and self.pila[-1][2]:
+            self._cerrar(time.perf_counter_ns())
+        self.comenzar(nombre)
+        self.pila[-1][2] = True
+
+    def terminar(self):
+        ahora = time.perf_counter_ns()
+        while self.pila and self.pila[-1][2]:
+            self._cerrar(ahora)
+        if self.pila:
+            self._cerrar(ahora)
+
+    def _cerrar(self, fin_ns):
+        nombre, inicio_ns, _ = self.pila.pop()
+        self._registrar(nombre, inicio_ns, fin_ns)
+
+    def _registrar(self, nombre, inicio_ns, fin_ns):
+        estadistica = self.estadisticas.get(nombre)
+        if estadistica is None:
+            estadistica = self.estadisticas[nombre] = Estadistica(self.capacidad)
+        estadistica.agregar((fin_ns - inicio_ns) / 1e6)
+        self.eventos.append((nombre, inicio_ns, fin_ns))
+
+    def comenzar_frame(self):
+        self.inicio_frame_ns = time.perf_counter_ns()
+
+    def terminar_frame(self):
+        if self.inicio_frame_ns is None:
+            return
+        while self.pila:
+            self.terminar()
+        self._registrar("frame", self.inicio_frame_ns, time.perf_counter_ns())
+        self.inicio_frame_ns = None
+        self.frames += 1
+
+    # --- Resultados -----------------------------------------------------------
+
+    def resumen(self):
+        """Tabla de texto con percentiles por sección"""
+        lineas = [f"{'sección':<34}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}{'n':>8}  (ms)"]
+        for nombre in sorted(self.estadisticas):
+            e = self.estadisticas[nombre]
+            p = e.percentiles()
+            lineas.append(f"{nombre:<34}{p[50]:>8.3f}{p[95]:>8.3f}{p[99]:>8.3f}{p['max']:>8.3f}{e.cuenta:>8}")
+        return "\n".join(lineas)
+
+    def histogramas(self):
+        """{sección: [(límite_ms, cuenta), ...]}; el último límite es None (más que 33 ms)"""
+        limites = list(BORDES_MS) + [None]
+        return {nombre: list(zip(limites, e.histograma)) for nombre, e in self.estadisticas.items()}
+
+    def exportar_trace(self, ruta):
+        """Escribe los eventos en el formato de trazas de Chrome"""
+        eventos = []
+        for nombre, inicio_ns, fin_ns in self.eventos:
+            eventos.append({
+                "name": nombre.rsplit("/", 1)[-1],
+                "cat": nombre.split("/", 1)[0],
+                "ph": "X",
+                "ts": (inicio_ns - self.origen_ns) / 1000,
+                "dur": (fin_ns - inicio_ns) / 1000,
+                "pid": 1,
+                "tid": 1,
+            })
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, f)
+
+    # --- Overlay --------------------------------------------------------------
+
+    def alternar_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+
+    def dibujar_overlay(self, pantalla, cada=30):
+        """Dibuja los percentiles de cada sección; el texto se vuelve a armar cada `cada` frames"""
+        if not self.overlay_visible:
+            return
+        import pygame
+        if self._overlay is None or self.frames % cada == 0:
+            if self._fuente is None:
+                self._fuente = pygame.font.SysFont("Courier", 12)
+            lineas = self.resumen().splitlines()
+            alto_linea = self._fuente.get_linesize()
+            superficie = pygame.Surface((430, alto_linea * len(lineas) + 8), pygame.SRCALPHA)
+            superficie.fill((0, 0, 0, 170))
+            for i, linea in enumerate(lineas):
+                superficie.blit(self._fuente.render(linea, True, (255, 255, 0)), (4, 4 + i * alto_linea))
+            self._overlay = superficie
+        pantalla.blit(self._overlay, (pantalla.get_width() - self._overlay.get_width() - 5, 5))
+
+
+class PerfiladorNulo:
+    """Mismas marcas que Perfilador pero sin hacer nada"""
+    activo = False
+    overlay_visible = False
+
+    def comenzar(self, nombre):
+        pass
+
+    def paso(self, nombre):
+        pass
+
+    def terminar(self):
+        pass
+
+    def comenzar_frame(self):
+        pass
+
+    def terminar_frame(self):
+        pass
+
+    def alternar_overlay(self):
+        pass
+
+    def dibujar_overlay(self, pantalla, cada=30):
+        pass
+
+
+PERFIL_NULO = PerfiladorNulo()
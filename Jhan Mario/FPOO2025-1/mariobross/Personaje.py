@@ -1,4 +1,6 @@
 class Personaje:
+    __slots__ = ("id", "nombre", "posicionX", "posicionY", "estado")
+
     def __init__(self, id, nombre, x, y, estado="Vivo"):
         self.id         = id
         self.nombre     = nombre
@@ -11,6 +13,8 @@ class Personaje:
         self.posicionY += dy
 
 class Jugador(Personaje):
+    __slots__ = ("vidas", "monedas", "puntos", "tiempo", "dispara", "tamano", "canvas_id")
+
     def __init__(self, id, nombre, x=0, y=0):
         super().__init__(id, nombre, x, y)
         self.vidas   = 3
@@ -0,0 +1,65 @@
+# Pool de entidades reutilizables (goombas, tortugas, monedas).
+# Las entidades inactivas no se tiran: pasan a la lista de libres y se
+# reinician en su lugar cuando hace falta otra. Las inactivas se quitan de la
+# lista de activas intercambiándolas con la última (sin armar listas nuevas en
+# cada frame), así una partida larga no genera basura para el recolector.
+
+
+class PoolEntidades:
+    """Entidades activas más las libres listas para reutilizar.
+    Las entidades necesitan un atributo `activo` y un método reiniciar(*args)."""
+    def __init__(self, fabrica):
+        self.fabrica = fabrica
+        self.activos = []
+        self.libres = []
+        self.creados = 0
+
+    def __len__(self):
+        return len(self.activos)
+
+    def __iter__(self):
+        return iter(self.activos)
+
+    def __getitem__(self, i):
+        return self.activos[i]
+
+    def obtener(self, *args):
+        """Entidad activa nueva: reutiliza una libre si hay, si no la crea"""
+        if self.libres:
+            obj = self.libres.pop()
+            obj.reiniciar(*args)
+        else:
+            obj = self.fabrica(*args)
+            self.creados += 1
+        self.activos.append(obj)
+        return obj
+
+    def compactar(self):
+        """Pasa las entidades inactivas a libres (no conserva el orden de las activas)"""
+        activos = self.activos
+        i = 0
+        while i < len(activos):
+            obj = activos[i]
+            if obj.activo:
+                i += 1
+                continue
+            ultimo = activos.pop()
+            if ultimo is not obj:
+                activos[i] = ultimo
+            self.libres.append(obj)
+
+    def liberar_todos(self):
+        self.libres.extend(self.activos)
+        self.activos.clear()
+
+    def fijar_cantidad(self, n):
+        """Deja exactamente n activas sin reiniciarlas (para quien les escribe el estado, ver Instantanea.py)"""
+        activos = self.activos
+        while len(activos) > n:
+            self.libres.append(activos.pop())
+        while len(activos) < n:
+            if self.libres:
+                activos.append(self.libres.pop())
+            else:
+                activos.append(self.fabrica())
+                self.creados += 1
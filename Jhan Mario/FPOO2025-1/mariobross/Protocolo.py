@@ -0,0 +1,113 @@
+# Protocolo binario entre Servidor.py y Cliente.py (TCP en localhost).
+# Cada mensaje va precedido por su largo (uint32) y empieza con un byte de tipo:
+#   cliente -> servidor   b"J" + nombre de la sala (utf-8)     unirse a una sala
+#                         b"K" + uint8 índice en Reglas.TECLAS  tecla presionada
+#   servidor -> cliente   b"H" + uint16 id del jugador propio
+#                         b"S" + instantánea (completa o delta)
+#
+# Instantánea: uint32 tick, uint8 completa, y luego cuatro listas (cada una con
+# su cantidad en uint16):
+#   jugadores cambiados: uint16 id, uint8 máscara de campos, campos marcados
+#   jugadores que se fueron: uint16 id
+#   recogibles nuevos: uint16 id, uint8 tipo, int32 x, int32 y
+#   recogibles quitados: uint16 id
+# Como TCP entrega en orden, el delta de cada tick se arma una sola vez contra
+# el tick anterior y se envía igual a todos los clientes al día.
+import struct
+
+LARGO = struct.Struct("<I")
+CABECERA = struct.Struct("<cIB")
+CANTIDAD = struct.Struct("<H")
+ID_MASCARA = struct.Struct("<HB")
+RECOGIBLE = struct.Struct("<HBii")
+HOLA = struct.Struct("<cH")
+
+# Campos del jugador en la red: (nombre, formato struct)
+CAMPOS = (
+    ("posicionX", "i"),
+    ("posicionY", "i"),
+    ("vidas", "B"),
+    ("monedas", "H"),
+    ("puntos", "I"),
+    ("tiempo", "H"),
+    ("grande", "B"),
+    ("sprite", "B"),
+)
+FORMATOS = [struct.Struct("<" + f) for _, f in CAMPOS]
+TODOS = (1 << len(CAMPOS)) - 1
+
+TIPOS_RECOGIBLE = ("hongoRojo", "hongoVerde")
+
+
+def enmarcar(datos):
+    return LARGO.pack(len(datos)) + datos
+
+
+async def leer_mensaje(lector):
+    largo, = LARGO.unpack(await lector.readexactly(LARGO.size))
+    return await lector.readexactly(largo)
+
+
+def mascara(previo, actual):
+    """Bits de los campos que cambiaron (todos si no había valor previo)"""
+    if previo is None:
+        return TODOS
+    m = 0
+    for i, (a, b) in enumerate(zip(previo, actual)):
+        if a != b:
+            m |= 1 << i
+    return m
+
+
+def codificar_instantanea(tick, completa, jugadores, salidos, recogibles, quitados):
+    """jugadores: [(id, máscara, valores)]; recogibles: [(id, tipo, x, y)]"""
+    partes = [CABECERA.pack(b"S", tick, completa), CANTIDAD.pack(len(jugadores))]
+    for jid, m, valores in jugadores:
+        partes.append(ID_MASCARA.pack(jid, m))
+        for i, formato in enumerate(FORMATOS):
+            if m & (1 << i):
+                partes.append(formato.pack(valores[i]))
+    partes.append(CANTIDAD.pack(len(salidos)))
+    partes.extend(CANTIDAD.pack(jid) for jid in salidos)
+    partes.append(CANTIDAD.pack(len(recogibles)))
+    partes.extend(RECOGIBLE.pack(rid, TIPOS_RECOGIBLE.index(tipo), x, y) for rid, tipo, x, y in recogibles)
+    partes.append(CANTIDAD.pack(len(quitados)))
+    partes.extend(CANTIDAD.pack(rid) for rid in quitados)
+    return b"".join(partes)
+
+
+def decodificar_instantanea(datos):
+    """Inverso de codificar_instantanea; en los jugadores solo vienen los campos marcados: {índice: valor}"""
+    _, tick, completa = CABECERA.unpack_from(datos, 0)
+    pos = CABECERA.size
+
+    def cantidad():
+        nonlocal pos
+        n, = CANTIDAD.unpack_from(datos, pos)
+        pos += CANTIDAD.size
+        return n
+
+    jugadores = []
+    for _ in range(cantidad()):
+        jid, m = ID_MASCARA.unpack_from(datos, pos)
+        pos += ID_MASCARA.size
+        campos = {}
+        for i, formato in enumerate(FORMATOS):
+            if m & (1 << i):
+                campos[i], = formato.unpack_from(datos, pos)
+                pos += formato.size
+        jugadores.append((jid, campos))
+    salidos = []
+    for _ in range(cantidad()):
+        salidos.append(CANTIDAD.unpack_from(datos, pos)[0])
+        pos += CANTIDAD.size
+    recogibles = []
+    for _ in range(cantidad()):
+        rid, tipo, x, y = RECOGIBLE.unpack_from(datos, pos)
+        pos += RECOGIBLE.size
+        recogibles.append((rid, TIPOS_RECOGIBLE[tipo], x, y))
+    quitados = []
+    for _ in range(cantidad()):
+        quitados.append(CANTIDAD.unpack_from(datos, pos)[0])
+        pos += CANTIDAD.size
+    return tick, bool(completa), jugadores, salidos, recogibles, quitados
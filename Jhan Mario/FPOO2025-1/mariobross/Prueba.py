@@ -1,17 +1,46 @@
 import os
-import pygame
 import random
+import time
+
+# Modo sin ventana: se activa con MARIO_HEADLESS=1 antes de importar el módulo
+MODO_HEADLESS = os.environ.get("MARIO_HEADLESS") == "1"
+if MODO_HEADLESS:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import Entidades
+from Entidades import AlmacenEntidades, GOOMBA, TORTUGA, MONEDA, NORMAL, DISPARADA
+from Colisiones import RejillaEspacial
+from Pool import PoolEntidades
+from Colocacion import colocar_en_rejilla
+from Mundo import VistaCamara
+from Render import PantallaRectsSucios
+from Recursos import AtlasSprites, escalar_pygame
+from Audio import CargadorAudio
+from Hud import CapaHud, CacheTexto
+from Repeticion import GrabadorEntrada, guardar_grabacion, suma_estado
+from Perfilador import PERFIL_NULO
+from Instantanea import Rebobinado, guardar_punto, cargar_punto
+import Registro
 
 # Inicialización
 pygame.init()
 pygame.font.init()
-pygame.mixer.init()
+if not MODO_HEADLESS:
+    pygame.mixer.init()
 
 # Constantes
 ANCHO_VENTANA = 800
 ALTO_VENTANA = 600
 LIMITE_INFERIOR = 500
 FPS = 60
+# ✅ Paso fijo de la simulación: todos los temporizadores avanzan PASO_SIM por paso,
+# sin importar cuántas veces por segundo se dibuje
+PASO_SIM = 1 / FPS
+MAX_PASOS_POR_FRAME = 5  # si un frame tarda más, el juego se frena en vez de acumular atraso sin fin
+PASOS_ENTRE_PUNTOS = FPS * 10  # cada cuánto se escribe el punto de control en disco
 COLOR_FONDO = (135, 206, 250)
 COLOR_TEXTO = (255, 255, 255)
 FUENTE = pygame.font.SysFont('Arial', 24)
@@ -19,8 +48,80 @@ FUENTE = pygame.font.SysFont('Arial', 24)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ASSETS_DIR = os.path.join(BASE_DIR, "assets", "images")
 
+SPRITES = {
+    "fondo": ("fondo.png", (ANCHO_VENTANA, ALTO_VENTANA)),
+    "jugador_pequeno": ("1.png", (40, 50)),
+    "jugador_grande": ("1.png", (40, 80)),
+    "goomba_cafe": ("goomba.png", (40, 40)),
+    "goomba_negro": ("goomba_muerte.png", (40, 30)),
+    "tortuga_normal": ("normal.png", (40, 40)),
+    "tortuga_caparazon": ("aplasta.png", (40, 30)),
+    "moneda": ("moneda.png", (30, 30)),
+    "hongo_crecimiento": ("hongoRojo.png", (40, 40)),
+    "hongo_vida": ("hongoVerde.png", (40, 40)),
+    "estrella": ("estrella.png", (30, 30)),
+}
+# Sprites sin transparencia: se convierten con convert() en vez de convert_alpha()
+SPRITES_OPACOS = ("fondo",)
+
+
+class ImagenesPygame:
+    """Sprites del atlas; cada uno se convierte al formato de la pantalla la primera vez que se usa"""
+    def __init__(self, atlas):
+        self.atlas = atlas
+        self.superficies = {}
+
+    def __getitem__(self, clave):
+        img = self.superficies.get(clave)
+        if img is None:
+            datos, tamano = self.atlas.rgba(clave)
+            if pygame.display.get_surface() is None:
+                img = pygame.image.frombytes(bytes(datos), tamano, "RGBA")
+            else:
+                img = pygame.image.frombuffer(datos, tamano, "RGBA")
+                img = img.convert() if clave in SPRITES_OPACOS else img.convert_alpha()
+            self.superficies[clave] = img
+        return img
+
+    def __contains__(self, clave):
+        return clave in self.atlas.especificaciones
+
+registro_juego = Registro.obtener("juego")
+registro_enemigos = Registro.obtener("enemigos")
+registro_monedas = Registro.obtener("monedas")
+registro_audio = Registro.obtener("audio")
+
+# Fuentes de entrada
+class EntradaTeclado:
+    """Lee las teclas reales del jugador"""
+    def leer(self):
+        keys = pygame.key.get_pressed()
+        return keys[pygame.K_LEFT], keys[pygame.K_RIGHT], keys[pygame.K_SPACE]
+
+
+class EntradaScript:
+    """Entrada guionizada: una tupla (izquierda, derecha, salto) por frame"""
+    def __init__(self, frames, repetir=False):
+        self.frames = list(frames)
+        self.repetir = repetir
+        self.indice = 0
+
+    def leer(self):
+        if self.indice >= len(self.frames):
+            if not self.repetir or not self.frames:
+                return False, False, False
+            self.indice = 0
+        frame = self.frames[self.indice]
+        self.indice += 1
+        return frame
+
+
 # Clases
 class Jugador:
+    __slots__ = ("ancho", "alto", "x", "y", "velocidad", "salto", "velocidad_salto", "contador_salto",
+                 "estado", "vidas", "inmunidad", "tiempo_inmunidad", "recogidas_monedas", "rect",
+                 "limite_derecho")
+
     def __init__(self):
         self.ancho = 40
         self.alto = 50
@@ -36,12 +137,19 @@ class Jugador:
         self.inmunidad = False
         self.tiempo_inmunidad = 0
         self.recogidas_monedas = 0
+        self.limite_derecho = ANCHO_VENTANA  # ancho del mundo cuando hay desplazamiento
+        # ✅ Rectángulo de colisión propio, se actualiza en el lugar al moverse
+        self.rect = pygame.Rect(self.x, self.y, self.ancho, self.alto)
+
+    def actualizar_rect(self):
+        self.rect.update(self.x, int(self.y), self.ancho, self.alto)
 
     def mover(self, direccion):
         if direccion == "izquierda":
             self.x = max(self.x - self.velocidad, 0)
         elif direccion == "derecha":
-            self.x = min(self.x + self.velocidad, ANCHO_VENTANA - self.ancho)
+            self.x = min(self.x + self.velocidad, self.limite_derecho - self.ancho)
+        self.rect.x = self.x
 
     def actualizar_salto(self):
         if self.salto:
@@ -55,10 +163,11 @@ class Jugador:
                 self.salto = False
                 self.contador_salto = self.velocidad_salto
                 self.y = LIMITE_INFERIOR - self.alto
+            self.rect.y = int(self.y)
 
     def actualizar_estado(self):
         if self.inmunidad:
-            self.tiempo_inmunidad -= 1 / FPS
+            self.tiempo_inmunidad -= PASO_SIM
             if self.tiempo_inmunidad <= 0:
                 self.inmunidad = False
 
@@ -75,6 +184,7 @@ class Jugador:
             self.estado = 'pequeño'
             self.alto = 50
             self.y = LIMITE_INFERIOR - self.alto
+            self.actualizar_rect()
         else:
             self.vidas = max(0, self.vidas - 1)
 
@@ -82,6 +192,7 @@ class Jugador:
         self.estado = 'grande'
         self.alto = 80
         self.y = LIMITE_INFERIOR - self.alto
+        self.actualizar_rect()
 
     def vida_extra(self):
         self.vidas += 1
@@ -99,17 +210,26 @@ class Jugador:
 
 
 class Goomba:
-    def __init__(self):
-        self.tipo = random.choice(['café', 'negro'])
+    __slots__ = ("tipo", "ancho", "alto", "x", "y", "velocidad", "activo", "rect")
+
+    def __init__(self, rng=random, x=ANCHO_VENTANA):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reiniciar(rng, x)
+
+    def reiniciar(self, rng=random, x=ANCHO_VENTANA):
+        """Deja el goomba como recién creado (para reutilizarlo desde el pool)"""
+        self.tipo = rng.choice(['café', 'negro'])
         self.ancho = 40
         self.alto = 40
-        self.x = ANCHO_VENTANA
+        self.x = x
         self.y = LIMITE_INFERIOR - self.alto
         self.velocidad = 3
         self.activo = True
+        self.rect.update(self.x, self.y, self.ancho, self.alto)
 
     def mover(self):
         self.x -= self.velocidad
+        self.rect.x = self.x
         if self.x + self.ancho < 0:
             self.activo = False
 
@@ -118,22 +238,30 @@ class Goomba:
         pantalla.blit(img, (self.x, self.y))
 
     def colisiona_con(self, jugador):
-        rect1 = pygame.Rect(self.x, self.y, self.ancho, self.alto)
-        rect2 = pygame.Rect(jugador.x, jugador.y, jugador.ancho, jugador.alto)
-        return rect1.colliderect(rect2)
+        return self.rect.colliderect(jugador.rect)
 
 
 class Tortuga:
-    def __init__(self):
+    __slots__ = ("ancho", "alto", "x", "y", "velocidad", "activo", "estado",
+                 "velocidad_caparazon", "direccion", "rect", "limite")
+
+    def __init__(self, x=ANCHO_VENTANA, limite=ANCHO_VENTANA):
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reiniciar(x, limite)
+
+    def reiniciar(self, x=ANCHO_VENTANA, limite=ANCHO_VENTANA):
+        """Deja la tortuga como recién creada (para reutilizarla desde el pool)"""
         self.ancho = 40
         self.alto = 40
-        self.x = ANCHO_VENTANA
+        self.x = x
+        self.limite = limite  # borde derecho del mundo
         self.y = LIMITE_INFERIOR - self.alto
         self.velocidad = 2
         self.activo = True
         self.estado = 'normal'  # 'normal', 'caparazon' o 'disparada'
         self.velocidad_caparazon = 8  # ✅ Velocidad más rápida para caparazón disparado
         self.direccion = -1
+        self.rect.update(self.x, self.y, self.ancho, self.alto)
 
     def mover(self):
         if self.estado == 'normal':
@@ -141,9 +269,10 @@ class Tortuga:
         elif self.estado == 'disparada':  # ✅ NUEVO ESTADO
             # Se mueve muy rápido y desaparece al salir de pantalla
             self.x += self.velocidad_caparazon * self.direccion
+        self.rect.x = self.x
         
         # ✅ Desactivar si sale de la pantalla en cualquier dirección
-        if (self.x + self.ancho < 0) or (self.x > ANCHO_VENTANA):
+        if (self.x + self.ancho < 0) or (self.x > self.limite):
             self.activo = False
 
     def ser_pisada(self, jugador):
@@ -152,6 +281,7 @@ class Tortuga:
             self.estado = 'disparada'  # ✅ Cambio: directamente a 'disparada'
             self.alto = 30
             self.y = LIMITE_INFERIOR - self.alto
+            self.rect.update(self.x, self.y, self.ancho, self.alto)
             
             # Determinar dirección basada en la posición del jugador
             if jugador.x < self.x:
@@ -159,7 +289,8 @@ class Tortuga:
             else:
                 self.direccion = -1  # Jugador a la derecha, caparazón va a la izquierda
             
-            print(f"🐢 ¡Tortuga pisada! Caparazón disparado hacia {'derecha' if self.direccion == 1 else 'izquierda'}")
+            registro_enemigos.debug("🐢 ¡Tortuga pisada! Caparazón disparado hacia %s",
+                                    'derecha' if self.direccion == 1 else 'izquierda')
             return True
         
         return False
@@ -171,33 +302,44 @@ class Tortuga:
             pantalla.blit(img_caparazon, (self.x, self.y))
 
     def colisiona_con(self, jugador):
-        rect1 = pygame.Rect(self.x, self.y, self.ancho, self.alto)
-        rect2 = pygame.Rect(jugador.x, jugador.y, jugador.ancho, jugador.alto)
-        return rect1.colliderect(rect2)
+        return self.rect.colliderect(jugador.rect)
 
 
 class ObjetoBeneficioso:
+    __slots__ = ("x", "y", "activo", "rect")
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
         self.activo = True
+        self.rect = pygame.Rect(x - 15, y - 15, 30, 30)
 
     def colisiona_con(self, jugador):
         if not self.activo:
             return False
-        rect1 = pygame.Rect(self.x - 15, self.y - 15, 30, 30)
-        rect2 = pygame.Rect(jugador.x, jugador.y, jugador.ancho, jugador.alto)
-        return rect1.colliderect(rect2)
+        return self.rect.colliderect(jugador.rect)
 
 
 class Moneda(ObjetoBeneficioso):
-    def __init__(self, x=None, y=None):
-        x = x or random.randint(20, ANCHO_VENTANA - 20)
+    __slots__ = ("ya_recogida", "clave")
+
+    def __init__(self, x=None, y=None, rng=random):
+        x = x or rng.randint(20, ANCHO_VENTANA - 20)
         min_altura = LIMITE_INFERIOR - 60
         max_altura = LIMITE_INFERIOR - 20
-        y = y or random.randint(min_altura, max_altura)
+        y = y or rng.randint(min_altura, max_altura)
         super().__init__(x, y)
         self.ya_recogida = False
+        self.clave = None  # (tramo, índice) cuando la moneda viene de un nivel
+
+    def reiniciar(self, x, y):
+        """Mueve la moneda a (x, y) y la deja sin recoger (para reutilizarla desde el pool)"""
+        self.x = x
+        self.y = y
+        self.activo = True
+        self.ya_recogida = False
+        self.clave = None
+        self.rect.update(x - 15, y - 15, 30, 30)
 
     def dibujar(self, pantalla, img):
         if self.activo and not self.ya_recogida:
@@ -206,12 +348,12 @@ class Moneda(ObjetoBeneficioso):
     def colisiona_con(self, jugador):
         if not self.activo or self.ya_recogida:
             return False
-        rect1 = pygame.Rect(self.x - 15, self.y - 15, 30, 30)
-        rect2 = pygame.Rect(jugador.x, jugador.y, jugador.ancho, jugador.alto)
-        return rect1.colliderect(rect2)
+        return self.rect.colliderect(jugador.rect)
 
 
 class Hongo(ObjetoBeneficioso):
+    __slots__ = ("tipo", "radio", "tiempo_visible")
+
     def __init__(self, tipo, posicion):
         super().__init__(*posicion)
         self.tipo = tipo
@@ -230,12 +372,14 @@ class Hongo(ObjetoBeneficioso):
 
     def actualizar(self):
         if self.activo:
-            self.tiempo_visible -= 1 / FPS
+            self.tiempo_visible -= PASO_SIM
             if self.tiempo_visible <= 0:
                 self.activo = False
 
 
 class Estrella(ObjetoBeneficioso):
+    __slots__ = ("radio",)
+
     def __init__(self, posicion):
         super().__init__(*posicion)
         self.radio = 15
@@ -246,40 +390,92 @@ class Estrella(ObjetoBeneficioso):
 
 
 class Juego:
-    def __init__(self):
-        self.pantalla = pygame.display.set_mode((ANCHO_VENTANA, ALTO_VENTANA))
-        
-        self.cargar_audio()
-        
-        pygame.display.set_caption("Mario Mosquera Game")
+    def __init__(self, headless=False, entrada=None, usar_almacen=False, rects_sucios=False,
+                 semilla=None, grabar=None, perfil=None, mundo=None, fps_render=FPS, interpolar=False,
+                 rebobinado=0, punto=None):
+        # ✅ Generador aleatorio propio: con la misma semilla y la misma entrada la partida se repite igual
+        if semilla is None:
+            semilla = random.getrandbits(63)
+        self.semilla = semilla
+        self.rng = random.Random(semilla)
+        # ✅ Medición por fase y por paso (Perfilador); sin perfil las marcas no hacen nada
+        self.perf = perfil or PERFIL_NULO
+
+        # ✅ En modo headless no hay ventana, ni mezclador, ni límite de FPS
+        self.headless = headless
+        if entrada is None:
+            entrada = EntradaScript([]) if headless else EntradaTeclado()
+        # ✅ Grabación de la entrada de cada frame para poder repetir la partida
+        self.ruta_grabacion = grabar
+        if grabar:
+            entrada = GrabadorEntrada(entrada)
+        self.entrada = entrada
+
+        self.sonido_moneda = None
+        self.musica_fondo = None
+        self.cargador_audio = None
+        if headless:
+            self.pantalla = None
+        else:
+            self.pantalla = pygame.display.set_mode((ANCHO_VENTANA, ALTO_VENTANA))
+            self.cargar_audio()
+            pygame.display.set_caption("Mario Mosquera Game")
+
         self.clock = pygame.time.Clock()
+        # ✅ Render separado de la simulación: fps_render=0 dibuja sin límite; con
+        # interpolar, las posiciones se mezclan entre los dos últimos pasos
+        self.fps_render = fps_render
+        self.interpolar = interpolar
+        self.posiciones_previas = []
         self.jugador = Jugador()
+
+        # ✅ Mundo con desplazamiento (opcional): tramos que se cargan y descargan según la cámara
+        self.mundo = mundo
+        self.limite_mundo = ANCHO_VENTANA
+        if mundo:
+            self.limite_mundo = mundo.ancho if mundo.ancho is not None else float("inf")
+            self.jugador.limite_derecho = self.limite_mundo
+            if usar_almacen:
+                registro_juego.warning("⚠️ El almacén de numpy no se usa con mundo desplazable")
+                usar_almacen = False
+            if grabar:
+                registro_juego.warning("⚠️ La grabación no guarda el nivel; solo se puede repetir sin mundo")
+        if (rebobinado or punto) and (mundo or usar_almacen or grabar):
+            registro_juego.warning("⚠️ Rebobinar y los puntos de control no funcionan con mundo, almacén ni grabación")
+            rebobinado, punto = 0, None
+
+        # ✅ Almacén en arreglos de NumPy (opcional) para muchos enemigos y monedas
+        self.usar_almacen = usar_almacen and Entidades.numpy_disponible()
+        if usar_almacen and not self.usar_almacen:
+            registro_juego.warning("⚠️ numpy no está instalado, se usan listas de objetos")
+        if self.usar_almacen:
+            self.almacen_enemigos = AlmacenEntidades()
+            self.almacen_monedas = AlmacenEntidades()
         
-        def load_img(name, size):
-            return pygame.transform.scale(pygame.image.load(os.path.join(ASSETS_DIR, name)), size)
-
-        self.imgs = {
-            "fondo": load_img("fondo.png", (ANCHO_VENTANA, ALTO_VENTANA)),
-            "jugador_pequeno": load_img("1.png", (40, 50)),
-            "jugador_grande": load_img("1.png", (40, 80)),
-            "goomba_cafe": load_img("goomba.png", (40, 40)),
-            "goomba_negro": load_img("goomba_muerte.png", (40, 30)),
-            "tortuga_normal": load_img("normal.png", (40, 40)),
-            "tortuga_caparazon": load_img("aplasta.png", (40, 30)),
-            "moneda": load_img("moneda.png", (30, 30)),
-            "hongo_crecimiento": load_img("hongoRojo.png", (40, 40)),
-            "hongo_vida": load_img("hongoVerde.png", (40, 40)),
-            "estrella": load_img("estrella.png", (30, 30))
-        }
+        # ✅ Sprites pre-escalados desde el atlas en caché (se carga al primer uso)
+        self.imgs = {} if headless else ImagenesPygame(AtlasSprites("pygame", SPRITES, escalar_pygame, ASSETS_DIR))
+
+        # ✅ HUD con textos en caché
+        self.hud = CapaHud(FUENTE, COLOR_TEXTO)
+        self.textos_fin = CacheTexto(FUENTE, (255, 0, 0))
+
+        # ✅ Render por rectángulos sucios (opcional): solo se actualiza lo que cambió
+        self.lienzo = None
+        if rects_sucios and not headless:
+            self.lienzo = PantallaRectsSucios(self.pantalla, self.imgs["fondo"])
 
-        self.monedas = []
-        self.generar_monedas()
+        # ✅ Pools: las entidades inactivas se reutilizan en vez de crear objetos nuevos
+        self.monedas = PoolEntidades(Moneda)
+        self.rejilla_monedas = RejillaEspacial()
         self.hongo_crecimiento = Hongo("crecimiento", (600, LIMITE_INFERIOR - 60))
         self.hongo_vida = Hongo("vida", (700, LIMITE_INFERIOR - 60))
         self.estrella = Estrella((650, LIMITE_INFERIOR - 60))
 
-        self.goombas = []
-        self.tortugas = []
+        self.goombas = PoolEntidades(Goomba)
+        self.tortugas = PoolEntidades(Tortuga)
+        # ✅ Broadphase: rejillas que se reconstruyen cada frame
+        self.rejilla_goombas = RejillaEspacial()
+        self.rejilla_tortugas = RejillaEspacial()
         self.enemigos_creados_total = 0
         self.max_enemigos_total = 15
         self.max_enemigos_simultaneos = 3
@@ -287,48 +483,42 @@ class Juego:
         self.tiempo_minimo_entre_enemigos = 2
         self.juego_terminado = False
 
+        if mundo:
+            self.actualizar_mundo()
+        else:
+            self.generar_monedas()
+
         self.musica_pausada = False
         
         # ✅ CONTROL DE SONIDO MEJORADO
         self.puede_reproducir_sonido_moneda = True
         self.tiempo_ultimo_sonido_moneda = 0
         self.cooldown_sonido_moneda = 0.3  # 300ms entre sonidos
-        
-        self.iniciar_musica_fondo()
+
+        # ✅ Rebobinar (mantener R) con los últimos `rebobinado` segundos en memoria, y
+        # punto de control en disco para retomar la partida si se cierra
+        self.rebobinado = Rebobinado(self, int(rebobinado * FPS)) if rebobinado else None
+        self.rebobinando = False
+        self.ruta_punto = punto
+        self.pasos_desde_punto = 0
+        if punto and os.path.exists(punto):
+            cargar_punto(punto, self)
+            registro_juego.info("💾 Partida retomada desde %s", punto)
 
     def cargar_audio(self):
-        """✅ FUNCIÓN MEJORADA: Mejor control de volúmenes"""
-        try:
-            SOUNDS_DIR = os.path.join(BASE_DIR, "assets", "sounds")
-            
-            # ✅ Cargar sonido de moneda con volumen reducido
-            sound_path = os.path.join(SOUNDS_DIR, "Moneda.wav")
-            if os.path.exists(sound_path):
-                self.sonido_moneda = pygame.mixer.Sound(sound_path)
-                self.sonido_moneda.set_volume(0.15)  # ✅ Volumen muy bajo (15%)
-                print("✅ Sonido de moneda cargado con volumen reducido")
-            else:
-                print(f"⚠️ Archivo de sonido no encontrado: {sound_path}")
-                self.sonido_moneda = None
-            
-            # ✅ Cargar música de fondo
-            self.musica_fondo = None
-            formatos_musica = ["Tono.wav", "fondo.mp3", "fondo.wav", "fondo.ogg", "background.mp3", "background.wav", "music.mp3"]
-            
-            for nombre_archivo in formatos_musica:
-                music_path = os.path.join(SOUNDS_DIR, nombre_archivo)
-                if os.path.exists(music_path):
-                    self.musica_fondo = music_path
-                    print(f"🎵 Música de fondo encontrada: {nombre_archivo}")
-                    break
-            
-            if not self.musica_fondo:
-                print("⚠️ No se encontró música de fondo")
-                    
-        except Exception as e:
-            print(f"⚠️ Error al cargar audio: {e}")
-            self.sonido_moneda = None
-            self.musica_fondo = None
+        """✅ El audio se carga en un hilo aparte; el juego ya puede dibujar mientras tanto"""
+        self.cargador_audio = CargadorAudio().iniciar()
+
+    def comprobar_audio(self):
+        """Aplica el audio cargado en segundo plano en cuanto está listo"""
+        cargador = self.cargador_audio
+        if cargador is None or not cargador.listo.is_set():
+            return
+        self.cargador_audio = None
+        self.sonido_moneda = cargador.sonido_moneda
+        self.musica_fondo = cargador.musica_fondo
+        if not self.juego_terminado:
+            self.iniciar_musica_fondo()
 
     def iniciar_musica_fondo(self):
         """✅ FUNCIÓN MEJORADA: Volumen balanceado"""
@@ -337,9 +527,9 @@ class Juego:
                 pygame.mixer.music.load(self.musica_fondo)
                 pygame.mixer.music.set_volume(0.3)  # ✅ Volumen reducido (30%)
                 pygame.mixer.music.play(-1)
-                print("🎵 Música de fondo iniciada con volumen balanceado")
+                registro_audio.info("🎵 Música de fondo iniciada con volumen balanceado")
             except Exception as e:
-                print(f"⚠️ Error al reproducir música de fondo: {e}")
+                registro_audio.warning("⚠️ Error al reproducir música de fondo: %s", e)
 
     def reproducir_sonido_moneda(self):
         """✅ NUEVA FUNCIÓN: Control inteligente del sonido de moneda"""
@@ -354,13 +544,13 @@ class Juego:
                 # ✅ Reproducir nuevo sonido
                 self.sonido_moneda.play()
                 self.tiempo_ultimo_sonido_moneda = tiempo_actual
-                print("🪙 Sonido de moneda reproducido")
+                registro_audio.debug("🪙 Sonido de moneda reproducido")
                 return True
             except Exception as e:
-                print(f"⚠️ Error al reproducir sonido: {e}")
+                registro_audio.warning("⚠️ Error al reproducir sonido: %s", e)
                 return False
         else:
-            print("⏳ Sonido de moneda en cooldown")
+            registro_audio.debug("⏳ Sonido de moneda en cooldown")
             return False
 
     def alternar_musica(self):
@@ -368,68 +558,119 @@ class Juego:
             if self.musica_pausada:
                 pygame.mixer.music.unpause()
                 self.musica_pausada = False
-                print("▶️ Música reanudada")
+                registro_audio.info("▶️ Música reanudada")
             else:
                 pygame.mixer.music.pause()
                 self.musica_pausada = True
-                print("⏸️ Música pausada")
+                registro_audio.info("⏸️ Música pausada")
         except Exception as e:
-            print(f"⚠️ Error al alternar música: {e}")
+            registro_audio.warning("⚠️ Error al alternar música: %s", e)
 
     def detener_musica(self):
         try:
             pygame.mixer.music.stop()
-            print("⏹️ Música detenida")
+            registro_audio.info("⏹️ Música detenida")
         except:
             pass
 
+    def agregar_moneda(self, x, y):
+        if self.usar_almacen:
+            self.almacen_monedas.agregar(MONEDA, x - 15, y - 15, 30, 30)
+        else:
+            self.monedas.obtener(x, y)
+
+    def total_monedas(self):
+        return self.almacen_monedas.n if self.usar_almacen else len(self.monedas)
+
     def generar_monedas(self):
-        self.monedas = []
-        jugador_rect = pygame.Rect(self.jugador.x, self.jugador.y, self.jugador.ancho, self.jugador.alto)
+        self.monedas.liberar_todos()
+        if self.usar_almacen:
+            self.almacen_monedas.limpiar()
+
+        # ✅ Rejilla con desplazamiento al azar: sin reintentos y sin monedas encimadas
+        area = (200, LIMITE_INFERIOR - 60, ANCHO_VENTANA - 20, LIMITE_INFERIOR - 20)
+        for x, y in colocar_en_rejilla(self.rng, 10, area, 30, separacion=4, excluir=(self.jugador.rect,)):
+            self.agregar_moneda(x, y)
         
-        for _ in range(10):
-            intentos = 0
-            while intentos < 100:
-                x = random.randint(200, ANCHO_VENTANA - 20)
-                min_altura = LIMITE_INFERIOR - 60
-                max_altura = LIMITE_INFERIOR - 20
-                y = random.randint(min_altura, max_altura)
-                
-                moneda_rect = pygame.Rect(x - 15, y - 15, 30, 30)
-                if not moneda_rect.colliderect(jugador_rect):
-                    self.monedas.append(Moneda(x, y))
-                    break
-                intentos += 1
-            
-            if intentos >= 100:
-                x = 300 + len(self.monedas) * 50
-                y = LIMITE_INFERIOR - 40
-                self.monedas.append(Moneda(x, y))
-        
-        print(f"Generadas {len(self.monedas)} monedas nuevas")
+        self.rejilla_monedas.reconstruir(self.monedas.activos)
+        registro_monedas.debug("Generadas %d monedas nuevas", self.total_monedas())
+
+    def x_aparicion(self):
+        """Los enemigos aparecen por el borde derecho de la pantalla"""
+        return self.mundo.camara.x + ANCHO_VENTANA if self.mundo else ANCHO_VENTANA
+
+    def actualizar_mundo(self):
+        """Mueve la cámara, carga los tramos cercanos y quita lo que quedó fuera de la zona cargada"""
+        mundo = self.mundo
+        mundo.camara.seguir(self.jugador.x, mundo.ancho)
+        nuevos, descartados = mundo.actualizar()
+        inicio, fin = mundo.limites_cargados()
+
+        for grupo in (self.goombas, self.tortugas):
+            for e in grupo:
+                if e.x + e.ancho < inicio or e.x >= fin:
+                    e.activo = False
+        if descartados:
+            for m in self.monedas:
+                if not inicio <= m.x < fin:
+                    m.activo = False
+
+        for indice in nuevos:
+            monedas, goombas, tortugas = mundo.entidades(indice)
+            for clave, x, y in monedas:
+                self.monedas.obtener(x, y).clave = clave
+            for x in goombas:
+                self.goombas.obtener(self.rng, x)
+            for x in tortugas:
+                self.tortugas.obtener(x, self.limite_mundo)
+        if nuevos or descartados:
+            self.monedas.compactar()
+            self.rejilla_monedas.reconstruir(self.monedas.activos)
+            registro_juego.debug("Tramos cargados: %s", sorted(mundo.cargados))
+
+    def activar_hongo(self, hongo, x_pantalla):
+        if self.mundo:
+            hongo.x = self.mundo.camara.x + x_pantalla
+            hongo.rect.x = hongo.x - 15
+        hongo.activar(10)
 
     def generar_enemigo(self):
-        total_enemigos = len(self.goombas) + len(self.tortugas)
+        if self.usar_almacen:
+            total_enemigos = self.almacen_enemigos.n
+        else:
+            total_enemigos = len(self.goombas) + len(self.tortugas)
         
         if total_enemigos < self.max_enemigos_simultaneos and self.enemigos_creados_total < self.max_enemigos_total:
-            if random.random() < 0.7:
-                self.goombas.append(Goomba())
-                print("🟫 Goomba generado")
+            if self.rng.random() < 0.7:
+                if self.usar_almacen:
+                    tipo = 0 if self.rng.choice(['café', 'negro']) == 'café' else 1
+                    self.almacen_enemigos.agregar(GOOMBA, ANCHO_VENTANA, LIMITE_INFERIOR - 40, 40, 40,
+                                                  velocidad=3, direccion=-1, tipo=tipo)
+                else:
+                    self.goombas.obtener(self.rng, self.x_aparicion())
+                registro_enemigos.debug("🟫 Goomba generado")
             else:
-                self.tortugas.append(Tortuga())
-                print("🐢 Tortuga generada")
+                if self.usar_almacen:
+                    self.almacen_enemigos.agregar(TORTUGA, ANCHO_VENTANA, LIMITE_INFERIOR - 40, 40, 40,
+                                                  velocidad=2, direccion=-1, estado=NORMAL)
+                else:
+                    self.tortugas.obtener(self.x_aparicion(), self.limite_mundo)
+                registro_enemigos.debug("🐢 Tortuga generada")
             
             self.enemigos_creados_total += 1
 
-    def manejar_eventos(self):
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT]:
+    def aplicar_entrada(self):
+        izquierda, derecha, salto = self.entrada.leer()
+        if izquierda:
             self.jugador.mover("izquierda")
-        if keys[pygame.K_RIGHT]:
+        if derecha:
             self.jugador.mover("derecha")
-        if keys[pygame.K_SPACE]:
+        if salto:
             if not self.jugador.salto:
                 self.jugador.salto = True
+
+    def manejar_eventos(self):
+        self.comprobar_audio()
         
         for e in pygame.event.get():
             if e.type == pygame.QUIT:
@@ -439,6 +680,12 @@ class Juego:
             if e.type == pygame.KEYDOWN:
                 if e.key == pygame.K_m:
                     self.alternar_musica()
+                elif e.key == pygame.K_F3:
+                    self.perf.alternar_overlay()
+                elif e.key == pygame.K_r:
+                    self.rebobinando = True
+            elif e.type == pygame.KEYUP and e.key == pygame.K_r:
+                self.rebobinando = False
         
         return True
 
@@ -446,145 +693,387 @@ class Juego:
         if self.juego_terminado:
             return
 
-        self.tiempo_desde_ultimo_enemigo += 1 / FPS
+        if self.mundo:
+            self.perf.paso("mundo")
+            self.actualizar_mundo()
+
+        self.perf.paso("aparicion")
+        self.tiempo_desde_ultimo_enemigo += PASO_SIM
         if self.tiempo_desde_ultimo_enemigo >= self.tiempo_minimo_entre_enemigos:
             self.generar_enemigo()
             self.tiempo_desde_ultimo_enemigo = 0
 
+        if self.usar_almacen:
+            self.actualizar_almacen()
+        else:
+            self.actualizar_objetos()
+
+        # Lógica para hongos
+        self.perf.paso("hongos")
+        for h in [self.hongo_crecimiento, self.hongo_vida]:
+            if h.colisiona_con(self.jugador) and h.activo:
+                if h.tipo == 'crecimiento':
+                    self.jugador.crecer()
+                else:
+                    self.jugador.vida_extra()
+                h.activo = False
+            h.actualizar()
+
+        if not self.hongo_crecimiento.activo and self.rng.random() < 1 / (FPS * 20):
+            self.activar_hongo(self.hongo_crecimiento, 600)
+        if not self.hongo_vida.activo and self.rng.random() < 1 / (FPS * 20):
+            self.activar_hongo(self.hongo_vida, 700)
+
+        if self.estrella.colisiona_con(self.jugador) and self.estrella.activo:
+            self.jugador.activar_inmunidad()
+            self.estrella.activo = False
+
+        self.perf.paso("jugador")
+        self.jugador.actualizar_salto()
+        self.jugador.actualizar_estado()
+
+    def estadisticas_colision(self):
+        """Pares candidatos del broadphase y pares probados con colisiona_con en el último frame"""
+        rejillas = (self.rejilla_goombas, self.rejilla_tortugas, self.rejilla_monedas)
+        return {
+            "candidatos": sum(r.pares_candidatos for r in rejillas),
+            "probados": sum(r.pares_probados for r in rejillas),
+        }
+
+    def actualizar_objetos(self):
+        self.perf.paso("enemigos")
+        for rejilla in (self.rejilla_goombas, self.rejilla_tortugas, self.rejilla_monedas):
+            rejilla.reiniciar_contadores()
+
         # Actualizar goombas
         for g in self.goombas:
             g.mover()
-        self.goombas = [g for g in self.goombas if g.activo]
+        self.goombas.compactar()
+        self.rejilla_goombas.reconstruir(self.goombas.activos)
 
         # Actualizar tortugas
         for t in self.tortugas:
             t.mover()
-        self.tortugas = [t for t in self.tortugas if t.activo]
+        self.tortugas.compactar()
+        self.rejilla_tortugas.reconstruir(self.tortugas.activos)
 
         # Colisiones con goombas
-        for g in self.goombas[:]:
-            if g.colisiona_con(self.jugador):
-                self.jugador.colisionar_con_enemigo()
-                g.activo = False
-                if self.jugador.vidas <= 0:
-                    self.juego_terminado = True
-                    self.detener_musica()
+        self.perf.paso("colision_goombas")
+        for g in self.rejilla_goombas.colisiones_con(self.jugador):
+            self.jugador.colisionar_con_enemigo()
+            g.activo = False
+            if self.jugador.vidas <= 0:
+                self.juego_terminado = True
+                self.detener_musica()
 
         # ✅ COLISIONES CON TORTUGAS MEJORADAS
-        for t in self.tortugas[:]:
-            if t.colisiona_con(self.jugador):
-                if self.jugador.esta_saltando_sobre(t):
-                    if t.ser_pisada(self.jugador):
-                        # ✅ Dar rebote al jugador
-                        self.jugador.contador_salto = self.jugador.velocidad_salto // 2
-                else:
-                    # ✅ Solo recibir daño si la tortuga está en estado normal
-                    if t.estado == 'normal' and not self.jugador.inmunidad:
-                        self.jugador.colisionar_con_enemigo()
-                        if self.jugador.vidas <= 0:
-                            self.juego_terminado = True
-                            self.detener_musica()
+        self.perf.paso("colision_tortugas")
+        for t in self.rejilla_tortugas.colisiones_con(self.jugador):
+            if self.jugador.esta_saltando_sobre(t):
+                if t.ser_pisada(self.jugador):
+                    # ✅ Dar rebote al jugador
+                    self.jugador.contador_salto = self.jugador.velocidad_salto // 2
+            else:
+                # ✅ Solo recibir daño si la tortuga está en estado normal
+                if t.estado == 'normal' and not self.jugador.inmunidad:
+                    self.jugador.colisionar_con_enemigo()
+                    if self.jugador.vidas <= 0:
+                        self.juego_terminado = True
+                        self.detener_musica()
 
         # ✅ COLISIONES ENTRE CAPARAZONES DISPARADOS Y GOOMBAS
+        self.perf.paso("colision_caparazones")
         for t in self.tortugas:
             if t.estado == 'disparada':
-                for g in self.goombas[:]:
-                    if g.colisiona_con(t):
-                        g.activo = False
-                        print("💥 ¡Caparazón disparado destruyó un Goomba!")
+                for g in self.rejilla_goombas.colisiones_con(t):
+                    g.activo = False
+                    registro_enemigos.debug("💥 ¡Caparazón disparado destruyó un Goomba!")
 
         # ✅ SISTEMA DE MONEDAS MEJORADO
-        for moneda in self.monedas[:]:  
-            if not moneda.ya_recogida and moneda.colisiona_con(self.jugador):
+        self.perf.paso("monedas")
+        for moneda in self.rejilla_monedas.colisiones_con(self.jugador):
+            if moneda.activo and not moneda.ya_recogida:
                 # ✅ Marcar inmediatamente como recogida
                 moneda.ya_recogida = True
                 moneda.activo = False
+                self.rejilla_monedas.quitar(moneda)
                 
                 # ✅ Incrementar contador
                 self.jugador.recogidas_monedas += 1
+                if moneda.clave is not None:
+                    self.mundo.monedas_recogidas.add(moneda.clave)
                 
                 # ✅ Reproducir sonido con control mejorado
                 self.reproducir_sonido_moneda()
                 
-                print(f"🪙 Moneda recogida! Total: {self.jugador.recogidas_monedas}")
+                registro_monedas.debug("🪙 Moneda recogida! Total: %d", self.jugador.recogidas_monedas)
                 
                 # ✅ Verificar vida extra
                 if self.jugador.recogidas_monedas >= 10:
                     self.jugador.vida_extra()
                     self.jugador.recogidas_monedas = 0
-                    print("¡Vida extra obtenida!")
-                    self.generar_monedas()
-                    break
+                    registro_juego.info("¡Vida extra obtenida!")
+                    if not self.mundo:  # en un nivel las monedas vienen de los tramos
+                        self.generar_monedas()
+                        break
         
-        # ✅ Limpiar monedas recogidas
-        self.monedas = [m for m in self.monedas if not m.ya_recogida]
-
-        # Lógica para hongos
-        for h in [self.hongo_crecimiento, self.hongo_vida]:
-            if h.colisiona_con(self.jugador) and h.activo:
-                if h.tipo == 'crecimiento':
-                    self.jugador.crecer()
-                else:
-                    self.jugador.vida_extra()
-                h.activo = False
-            h.actualizar()
-
-        if not self.hongo_crecimiento.activo and random.random() < 1 / (FPS * 20):
-            self.hongo_crecimiento.activar(10)
-        if not self.hongo_vida.activo and random.random() < 1 / (FPS * 20):
-            self.hongo_vida.activar(10)
-
-        if self.estrella.colisiona_con(self.jugador) and self.estrella.activo:
-            self.jugador.activar_inmunidad()
-            self.estrella.activo = False
+        # ✅ Limpiar monedas recogidas (vuelven al pool)
+        self.monedas.compactar()
+
+    def actualizar_almacen(self):
+        """✅ Misma lógica que actualizar_objetos pero en lote sobre arreglos de NumPy"""
+        enemigos = self.almacen_enemigos
+        jugador = self.jugador
+
+        self.perf.paso("enemigos")
+        enemigos.mover()
+        enemigos.descartar_fuera(0, ANCHO_VENTANA)
+
+        self.perf.paso("colision_enemigos")
+        for i in enemigos.colisiones_con(jugador.x, jugador.y, jugador.ancho, jugador.alto):
+            if enemigos.clase[i] == GOOMBA:
+                jugador.colisionar_con_enemigo()
+                enemigos.activo[i] = False
+                if jugador.vidas <= 0:
+                    self.juego_terminado = True
+                    self.detener_musica()
+            elif jugador.esta_saltando_sobre(enemigos.vista(i)):
+                if enemigos.estado[i] == NORMAL:
+                    # Caparazón disparado en dirección contraria al jugador
+                    enemigos.estado[i] = DISPARADA
+                    enemigos.alto[i] = 30
+                    enemigos.y[i] = LIMITE_INFERIOR - 30
+                    enemigos.velocidad[i] = 8
+                    enemigos.direccion[i] = 1 if jugador.x < enemigos.x[i] else -1
+                    registro_enemigos.debug("🐢 ¡Tortuga pisada! Caparazón disparado")
+                    jugador.contador_salto = jugador.velocidad_salto // 2
+            elif enemigos.estado[i] == NORMAL and not jugador.inmunidad:
+                jugador.colisionar_con_enemigo()
+                if jugador.vidas <= 0:
+                    self.juego_terminado = True
+                    self.detener_musica()
 
-        self.jugador.actualizar_salto()
-        self.jugador.actualizar_estado()
+        # Caparazones disparados contra goombas
+        self.perf.paso("colision_caparazones")
+        goombas = enemigos.indices(GOOMBA)
+        destruidos = enemigos.colisiones_entre(enemigos.indices(TORTUGA, DISPARADA), goombas)
+        if destruidos.any():
+            enemigos.activo[goombas[destruidos]] = False
+            registro_enemigos.debug("💥 ¡Caparazón disparado destruyó %d Goomba(s)!", int(destruidos.sum()))
+        enemigos.compactar()
+
+        self.perf.paso("monedas")
+        monedas = self.almacen_monedas
+        for i in monedas.colisiones_con(jugador.x, jugador.y, jugador.ancho, jugador.alto):
+            monedas.activo[i] = False
+            jugador.recogidas_monedas += 1
+            self.reproducir_sonido_moneda()
+            registro_monedas.debug("🪙 Moneda recogida! Total: %d", jugador.recogidas_monedas)
+            if jugador.recogidas_monedas >= 10:
+                jugador.vida_extra()
+                jugador.recogidas_monedas = 0
+                registro_juego.info("¡Vida extra obtenida!")
+                self.generar_monedas()
+                return
+        monedas.compactar()
 
     def dibujar(self):
-        self.pantalla.blit(self.imgs["fondo"], (0, 0))
+        self.perf.paso("fondo")
+        if self.lienzo:
+            pantalla = self.lienzo
+            pantalla.comenzar()
+        else:
+            pantalla = self.pantalla
+            pantalla.blit(self.imgs["fondo"], (0, 0))
         
         # Dibujar monedas
+        self.perf.paso("entidades")
+        # ✅ Con mundo, las entidades se dibujan relativas a la cámara y solo si están en pantalla
+        escena = VistaCamara(pantalla, self.mundo.camara) if self.mundo else pantalla
         for m in self.monedas:
-            m.dibujar(self.pantalla, self.imgs["moneda"])
+            m.dibujar(escena, self.imgs["moneda"])
+        if self.usar_almacen:
+            monedas = self.almacen_monedas
+            for i in range(monedas.n):
+                escena.blit(self.imgs["moneda"], (monedas.x[i], monedas.y[i]))
         
-        self.hongo_crecimiento.dibujar(self.pantalla, self.imgs["hongo_crecimiento"], self.imgs["hongo_vida"])
-        self.hongo_vida.dibujar(self.pantalla, self.imgs["hongo_crecimiento"], self.imgs["hongo_vida"])
-        self.estrella.dibujar(self.pantalla, self.imgs["estrella"])
+        self.hongo_crecimiento.dibujar(escena, self.imgs["hongo_crecimiento"], self.imgs["hongo_vida"])
+        self.hongo_vida.dibujar(escena, self.imgs["hongo_crecimiento"], self.imgs["hongo_vida"])
+        self.estrella.dibujar(escena, self.imgs["estrella"])
+
+        if self.usar_almacen:
+            self.dibujar_almacen(escena)
 
         # Dibujar goombas
         for g in self.goombas:
-            g.dibujar(self.pantalla, self.imgs["goomba_cafe"], self.imgs["goomba_negro"])
+            g.dibujar(escena, self.imgs["goomba_cafe"], self.imgs["goomba_negro"])
 
         # Dibujar tortugas
         for t in self.tortugas:
-            t.dibujar(self.pantalla, self.imgs["tortuga_normal"], self.imgs["tortuga_caparazon"])
+            t.dibujar(escena, self.imgs["tortuga_normal"], self.imgs["tortuga_caparazon"])
 
-        self.jugador.dibujar(self.pantalla, self.imgs["jugador_pequeno"], self.imgs["jugador_grande"])
+        self.jugador.dibujar(escena, self.imgs["jugador_pequeno"], self.imgs["jugador_grande"])
 
-        texto_vidas = FUENTE.render(f"Vidas: {self.jugador.vidas}", True, COLOR_TEXTO)
-        texto_monedas = FUENTE.render(f"Monedas: {self.jugador.recogidas_monedas}", True, COLOR_TEXTO)
+        self.perf.paso("hud")
+        texto_vidas = self.hud.contador("Vidas: ", self.jugador.vidas)
+        texto_monedas = self.hud.contador("Monedas: ", self.jugador.recogidas_monedas)
         
-        self.pantalla.blit(texto_vidas, (10, 10))
-        self.pantalla.blit(texto_monedas, (10, 40))
+        pantalla.blit(texto_vidas, (10, 10))
+        pantalla.blit(texto_monedas, (10, 40))
 
         if self.juego_terminado:
-            texto_fin = FUENTE.render("Game over", True, (255, 0, 0))
-            self.pantalla.blit(texto_fin, (ANCHO_VENTANA // 2 - texto_fin.get_width() // 2, ALTO_VENTANA // 2))
-
-        pygame.display.flip()
+            texto_fin = self.textos_fin.render("Game over")
+            pantalla.blit(texto_fin, (ANCHO_VENTANA // 2 - texto_fin.get_width() // 2, ALTO_VENTANA // 2))
+        self.perf.paso("overlay")
+        self.perf.dibujar_overlay(pantalla)
+
+        self.perf.paso("presentar")
+        if self.lienzo:
+            self.lienzo.terminar()
+        else:
+            pygame.display.flip()
+
+    def dibujar_almacen(self, pantalla):
+        enemigos = self.almacen_enemigos
+        for i in range(enemigos.n):
+            if enemigos.clase[i] == GOOMBA:
+                img = self.imgs["goomba_cafe"] if enemigos.tipo[i] == 0 else self.imgs["goomba_negro"]
+            elif enemigos.estado[i] == NORMAL:
+                img = self.imgs["tortuga_normal"]
+            else:
+                img = self.imgs["tortuga_caparazon"]
+            pantalla.blit(img, (enemigos.x[i], enemigos.y[i]))
+
+    def guardar_posiciones(self):
+        """Posiciones antes del paso, para interpolar el dibujo"""
+        objetos = [self.jugador, *self.goombas, *self.tortugas]
+        self.posiciones_previas = [(o, o.x, o.y) for o in objetos]
+
+    def aplicar_interpolacion(self, alfa):
+        """Mueve los objetos a la posición intermedia y devuelve lo necesario para restaurarlos"""
+        restaurar = []
+        for o, x_previa, y_previa in self.posiciones_previas:
+            x, y = o.x, o.y
+            if abs(x - x_previa) > 50 or abs(y - y_previa) > 50:
+                continue  # objeto reutilizado o teletransportado: no se interpola
+            restaurar.append((o, x, y))
+            o.x = x_previa + (x - x_previa) * alfa
+            o.y = y_previa + (y - y_previa) * alfa
+        return restaurar
 
     def ejecutar(self):
         corriendo = True
+        acumulado = 0.0
+        anterior = time.perf_counter()
         while corriendo:
-            self.clock.tick(FPS)
+            self.clock.tick(self.fps_render)
+            ahora = time.perf_counter()
+            acumulado += min(ahora - anterior, PASO_SIM * MAX_PASOS_POR_FRAME)
+            anterior = ahora
+
+            perf = self.perf
+            perf.comenzar_frame()
+            perf.comenzar("eventos")
             corriendo = self.manejar_eventos()
-            self.actualizar()
+            perf.terminar()
+
+            # ✅ Tantos pasos fijos como tiempo real pasó (0, 1 o varios por frame)
+            perf.comenzar("actualizar")
+            while acumulado >= PASO_SIM:
+                if self.interpolar:
+                    self.guardar_posiciones()
+                if self.rebobinando and self.rebobinado is not None:
+                    self.rebobinado.retroceder()
+                else:
+                    self.paso()
+                acumulado -= PASO_SIM
+            perf.terminar()
+
+            perf.comenzar("dibujar")
+            restaurar = self.aplicar_interpolacion(acumulado / PASO_SIM) if self.interpolar else ()
             self.dibujar()
+            for o, x, y in restaurar:
+                o.x, o.y = x, y
+            perf.terminar()
+            perf.terminar_frame()
         
         pygame.quit()
+        if self.ruta_punto:
+            self.actualizar_punto()
+        if self.ruta_grabacion:
+            guardar_grabacion(self.ruta_grabacion, self.semilla, self.entrada.frames,
+                              suma_estado(self), self.usar_almacen)
+            registro_juego.info("💾 Partida grabada en %s", self.ruta_grabacion)
+
+    def paso(self):
+        """Un paso fijo con la entrada del teclado, guardando antes el estado para poder volver"""
+        if self.rebobinado is not None:
+            self.rebobinado.guardar()
+        self.aplicar_entrada()
+        self.actualizar()
+        if self.ruta_punto:
+            self.pasos_desde_punto += 1
+            if self.pasos_desde_punto >= PASOS_ENTRE_PUNTOS:
+                self.actualizar_punto()
+                self.pasos_desde_punto = 0
+
+    def actualizar_punto(self):
+        """Guarda el punto de control; si la partida terminó lo borra, así la próxima empieza de cero"""
+        if self.juego_terminado:
+            if os.path.exists(self.ruta_punto):
+                os.remove(self.ruta_punto)
+                registro_juego.info("🗑️ Partida terminada: se borró el punto de control %s", self.ruta_punto)
+        else:
+            guardar_punto(self.ruta_punto, self)
+            registro_juego.debug("💾 Punto de control guardado en %s", self.ruta_punto)
+
+    def simular(self, frames):
+        """Avanza la lógica sin dibujar ni esperar al reloj. Devuelve los frames ejecutados."""
+        perf = self.perf
+        for i in range(frames):
+            perf.comenzar_frame()
+            self.aplicar_entrada()
+            perf.comenzar("actualizar")
+            self.actualizar()
+            perf.terminar()
+            perf.terminar_frame()
+            if self.juego_terminado:
+                return i + 1
+        return frames
 
 
 if __name__ == "__main__":
-    juego = Juego()
+    import sys
+    Registro.configurar()
+    # Uso: python Prueba.py [--rects-sucios] [--semilla=N] [--grabar=partida.rep]
+    #                       [--nivel=carpeta | --infinito]   (mundo con desplazamiento)
+    #                       [--perfil] [--overlay] [--trace=trazo.json]   (F3 muestra/oculta el overlay)
+    #                       [--fps=N] [--interpolar]   (N=0 dibuja sin límite; la lógica siempre va a 60 pasos/s)
+    #                       [--rebobinar=S] [--punto=partida.snap]   (mantener R vuelve atrás hasta S segundos)
+    opciones = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+    perfil = None
+    if "--perfil" in sys.argv or "--overlay" in sys.argv or "trace" in opciones:
+        from Perfilador import Perfilador
+        perfil = Perfilador()
+        perfil.overlay_visible = "--overlay" in sys.argv
+    mundo = None
+    if "nivel" in opciones or "--infinito" in sys.argv:
+        from Mundo import Mundo, FuenteNivel, FuenteAleatoria, NIVELES_DIR
+        if "nivel" in opciones:
+            carpeta = opciones["nivel"]
+            if not os.path.isdir(carpeta):
+                carpeta = os.path.join(NIVELES_DIR, carpeta)
+            mundo = Mundo(FuenteNivel(carpeta), ANCHO_VENTANA)
+        else:
+            mundo = Mundo(FuenteAleatoria(int(opciones.get("semilla", 0))), ANCHO_VENTANA)
+    juego = Juego(rects_sucios="--rects-sucios" in sys.argv,
+                  fps_render=int(opciones.get("fps", FPS)), interpolar="--interpolar" in sys.argv,
+                  semilla=int(opciones["semilla"]) if "semilla" in opciones else None,
+                  grabar=opciones.get("grabar"), perfil=perfil, mundo=mundo,
+                  rebobinado=float(opciones.get("rebobinar", 0)), punto=opciones.get("punto"))
     juego.ejecutar()
+    if perfil:
+        registro_juego.info("Tiempos por fase:\n%s", perfil.resumen())
+        if "trace" in opciones:
+            perfil.exportar_trace(opciones["trace"])
+            registro_juego.info("Trazo guardado en %s", opciones["trace"])
@@ -0,0 +1,118 @@
+# Atlas de sprites pre-escalados con caché en disco.
+# La primera vez se decodifican y escalan los PNG; el resultado (RGBA crudo)
+# se guarda en assets/cache en un solo archivo cuyo nombre incluye un hash de
+# la fecha de modificación y el tamaño de los PNG de origen, los tamaños
+# pedidos y el escalador. Las siguientes ejecuciones solo leen ese archivo
+# (sin abrir los PNG), y solo cuando se pide el primer sprite.
+#
+# Archivo: largo del índice (I) | crc32 de los píxeles (I) | índice JSON | píxeles RGBA
+# Si el largo o el crc no coinciden (archivo cortado o dañado) se reconstruye.
+# La carpeta de caché se puede cambiar con MARIO_CACHE=/otra/carpeta.
+# Lo usan Prueba.py (pygame) y Game.py (Tkinter + PIL).
+import hashlib
+import json
+import os
+import struct
+import zlib
+
+import Registro
+
+registro = Registro.obtener("recursos")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+IMAGENES_DIR = os.path.join(BASE_DIR, "assets", "images")
+CACHE_DIR = os.environ.get("MARIO_CACHE") or os.path.join(BASE_DIR, "assets", "cache")
+
+VERSION_ATLAS = 2
+CABECERA = struct.Struct("<II")
+
+
+def escalar_pygame(ruta, tamano):
+    import pygame
+    img = pygame.transform.scale(pygame.image.load(ruta), tamano)
+    return pygame.image.tobytes(img, "RGBA")
+
+
+def escalar_pil(ruta, tamano):
+    from PIL import Image
+    # Se escala antes de convertir para conservar el mismo filtro que Image.resize usaba antes
+    return Image.open(ruta).resize(tamano).convert("RGBA").tobytes()
+
+
+class AtlasSprites:
+    def __init__(self, nombre, especificaciones, escalar, directorio=IMAGENES_DIR, cache=CACHE_DIR):
+        """especificaciones: {clave: (archivo, (ancho, alto))}"""
+        self.nombre = nombre
+        self.especificaciones = especificaciones
+        self.escalar = escalar
+        self.directorio = directorio
+        self.cache = cache
+        self.indice = None
+        self.datos = None
+
+    def huella(self):
+        """Hash de la fecha y tamaño de los archivos de origen, tamaños y escalador"""
+        h = hashlib.sha1(f"{VERSION_ATLAS}:{self.escalar.__name__}".encode())
+        firmas = {}
+        for clave in sorted(self.especificaciones):
+            archivo, tamano = self.especificaciones[clave]
+            if archivo not in firmas:
+                info = os.stat(os.path.join(self.directorio, archivo))
+                firmas[archivo] = f"{info.st_mtime_ns}:{info.st_size}"
+            h.update(f"{clave}:{archivo}:{firmas[archivo]}:{tamano[0]}x{tamano[1]};".encode())
+        return h.hexdigest()[:16]
+
+    def ruta(self):
+        return os.path.join(self.cache, f"atlas_{self.nombre}_{self.huella()}.bin")
+
+    def cargar(self):
+        if self.datos is not None:
+            return
+        ruta = self.ruta()
+        try:
+            with open(ruta, "rb") as f:
+                contenido = f.read()
+            largo, crc = CABECERA.unpack_from(contenido, 0)
+            indice = json.loads(contenido[CABECERA.size:CABECERA.size + largo])
+            datos = memoryview(contenido)[CABECERA.size + largo:]
+            esperado = sum(ancho * alto * 4 for _, ancho, alto in indice.values())
+            if len(datos) != esperado or zlib.crc32(datos) != crc:
+                raise ValueError("atlas incompleto o dañado")
+            self.indice, self.datos = indice, datos
+        except (OSError, ValueError, struct.error) as e:
+            if not isinstance(e, FileNotFoundError):
+                registro.warning("⚠️ Atlas en caché no válido (%s), se reconstruye", e)
+            self.construir(ruta)
+
+    def construir(self, ruta):
+        indice = {}
+        bloques = []
+        desplazamiento = 0
+        for clave, (archivo, tamano) in self.especificaciones.items():
+            rgba = self.escalar(os.path.join(self.directorio, archivo), tamano)
+            indice[clave] = [desplazamiento, tamano[0], tamano[1]]
+            bloques.append(rgba)
+            desplazamiento += len(rgba)
+        cabecera = json.dumps(indice).encode()
+        self.indice = indice
+        self.datos = memoryview(b"".join(bloques))
+        try:
+            os.makedirs(self.cache, exist_ok=True)
+            # Borrar atlas viejos de este mismo frontend
+            for viejo in os.listdir(self.cache):
+                if viejo.startswith(f"atlas_{self.nombre}_"):
+                    os.remove(os.path.join(self.cache, viejo))
+            temporal = ruta + ".tmp"
+            with open(temporal, "wb") as f:
+                f.write(CABECERA.pack(len(cabecera), zlib.crc32(self.datos)))
+                f.write(cabecera)
+                f.write(self.datos)
+            os.replace(temporal, ruta)
+        except OSError as e:
+            registro.warning("⚠️ No se pudo guardar el atlas en caché: %s", e)
+
+    def rgba(self, clave):
+        """Bytes RGBA y tamaño del sprite ya escalado"""
+        self.cargar()
+        desplazamiento, ancho, alto = self.indice[clave]
+        return self.datos[desplazamiento:desplazamiento + ancho * alto * 4], (ancho, alto)
@@ -0,0 +1,110 @@
+# Registro de eventos del juego con niveles y categorías.
+# Usa el módulo logging: cada categoría es un logger "mario.<categoria>".
+# Los mensajes pasan por una cola y se escriben desde otro hilo, así el bucle
+# del juego nunca se bloquea escribiendo en stdout. Los mensajes DEBUG e INFO
+# idénticos se limitan por ventana de tiempo (WARNING o más siempre pasan) y
+# una categoría desactivada solo cuesta la comprobación de nivel
+# (registro.isEnabledFor), que logging guarda en caché.
+#
+# Configuración por variables de entorno:
+#   MARIO_LOG=DEBUG|INFO|WARNING|...            nivel general (INFO por defecto)
+#   MARIO_LOG_CATEGORIAS=audio=WARNING,monedas=DEBUG
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+
+RAIZ = "mario"
+CATEGORIAS = ("juego", "jugador", "enemigos", "monedas", "audio", "recursos", "red")
+FORMATO = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+_oyente = None
+
+
+def obtener(categoria):
+    return logging.getLogger(f"{RAIZ}.{categoria}")
+
+
+class FiltroRepeticiones(logging.Filter):
+    """Deja pasar como máximo `maximo` mensajes idénticos (ya formateados) por ventana de `segundos`.
+    Solo limita por debajo de WARNING: avisos y errores nunca se omiten."""
+    MAXIMO_VENTANAS = 1024  # al llegar aquí se olvidan las ventanas más viejas
+
+    def __init__(self, maximo=5, segundos=1.0):
+        super().__init__()
+        self.maximo = maximo
+        self.segundos = segundos
+        # (logger, mensaje) -> [inicio, cuenta, suprimidos], en orden de inicio de la ventana
+        self.ventanas = {}
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        # Se compara el mensaje formateado: "Jugador 1 entró" y "Jugador 2 salió" son eventos distintos
+        clave = (record.name, record.getMessage())
+        ahora = time.monotonic()
+        ventana = self.ventanas.get(clave)
+        if ventana is None or ahora - ventana[0] >= self.segundos:
+            suprimidos = ventana[2] if ventana else 0
+            self.ventanas.pop(clave, None)
+            self._podar(ahora)
+            self.ventanas[clave] = [ahora, 1, 0]  # al final: el dict queda ordenado por inicio
+            if suprimidos:
+                record.msg = f"{record.msg} (+{suprimidos} repetidos omitidos)"
+            return True
+        ventana[1] += 1
+        if ventana[1] <= self.maximo:
+            return True
+        ventana[2] += 1
+        return False
+
+    def _podar(self, ahora):
+        """Quita desde el principio las ventanas vencidas, y la más vieja si sigue lleno.
+        Se detiene en la primera vigente, así cada llamada cuesta O(1) amortizado."""
+        while self.ventanas:
+            clave = next(iter(self.ventanas))
+            if ahora - self.ventanas[clave][0] < self.segundos and len(self.ventanas) < self.MAXIMO_VENTANAS:
+                return
+            del self.ventanas[clave]
+
+
+def configurar(nivel=None, categorias=None, destino=None, maximo_repeticiones=5, ventana=1.0):
+    """Instala el manejador con cola en el logger raíz "mario". Se puede llamar varias veces."""
+    global _oyente
+    nivel = nivel or os.environ.get("MARIO_LOG", "INFO")
+    if categorias is None:
+        categorias = {}
+        for par in filter(None, os.environ.get("MARIO_LOG_CATEGORIAS", "").split(",")):
+            nombre, _, valor = par.partition("=")
+            categorias[nombre.strip()] = valor.strip() or "DEBUG"
+
+    detener()
+    cola = queue.SimpleQueue()
+    manejador_cola = logging.handlers.QueueHandler(cola)
+    manejador_cola.addFilter(FiltroRepeticiones(maximo_repeticiones, ventana))
+
+    salida = logging.StreamHandler(destino or sys.stdout)
+    salida.setFormatter(logging.Formatter(FORMATO))
+    _oyente = logging.handlers.QueueListener(cola, salida)
+    _oyente.start()
+
+    raiz = logging.getLogger(RAIZ)
+    raiz.handlers = [manejador_cola]
+    raiz.setLevel(nivel)
+    raiz.propagate = False
+    for nombre, valor in categorias.items():
+        obtener(nombre).setLevel(valor)
+
+
+def detener():
+    """Vacía la cola y detiene el hilo escritor"""
+    global _oyente
+    if _oyente is not None:
+        _oyente.stop()
+        _oyente = None
+
+
+atexit.register(detener)
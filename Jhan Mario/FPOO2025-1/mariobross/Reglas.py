@@ -0,0 +1,51 @@
+# Reglas del juego Tk sin nada de Tkinter: las usan Game.py (un jugador local)
+# y Servidor.py (muchos jugadores en red), así los dos mueven igual.
+# `st` es cualquier objeto con dx, jump_step, img_key, idle_key e img_ticks
+# (PlayerState en Game.py, EstadoJugador en Servidor.py).
+
+PASO_X      = 10
+JUMP_HEIGHT = 100
+JUMP_STEPS  = 10
+TICK_MS     = 20   # un solo tick mueve, salta y anima a todos los jugadores
+SPRITE_MS   = 100  # tiempo que se ve el sprite de caminar antes de volver al de reposo
+PICKUP_RADIO = 30  # distancia máxima (en X y en Y) para recoger un objeto
+
+ANCHO = 800
+ALTO = 400
+
+# Sprites de jugador, en el orden en que se numeran en la red
+SPRITES_JUGADOR = ("inicial", "inicialI", "izquierda", "derecha")
+TECLAS = ("Right", "Left", "Up")
+
+
+def aplicar_tecla(st, tecla):
+    """Anota la intención de la tecla; el movimiento se aplica en el próximo tick"""
+    if tecla == "Right":
+        st.dx += PASO_X
+        st.img_key, st.idle_key = "derecha", "inicial"
+        st.img_ticks = SPRITE_MS // TICK_MS
+    elif tecla == "Left":
+        st.dx -= PASO_X
+        st.img_key, st.idle_key = "izquierda", "inicialI"
+        st.img_ticks = SPRITE_MS // TICK_MS
+    elif tecla == "Up":
+        # El salto avanza un paso por tick; no se apila otro salto en el aire
+        if st.jump_step == 0:
+            st.jump_step = 1
+
+
+def avanzar(st):
+    """Un tick de salto y animación. Devuelve el (dx, dy) a aplicar al jugador."""
+    paso = JUMP_HEIGHT // JUMP_STEPS
+    dx, st.dx = st.dx, 0
+    dy = 0
+    if st.jump_step:
+        dy = -paso if st.jump_step <= JUMP_STEPS else paso
+        st.jump_step += 1
+        if st.jump_step > 2 * JUMP_STEPS:
+            st.jump_step = 0
+    if st.img_ticks:
+        st.img_ticks -= 1
+        if st.img_ticks == 0:
+            st.img_key = st.idle_key
+    return dx, dy
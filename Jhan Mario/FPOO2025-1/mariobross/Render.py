@@ -0,0 +1,51 @@
+# Render con rectángulos sucios: en vez de redibujar el fondo completo y hacer
+# flip() en cada frame, solo se restaura el fondo donde hubo sprites y se envían
+# a la pantalla las regiones que cambiaron.
+import pygame
+
+
+class PantallaRectsSucios:
+    """Envuelve la superficie de la ventana y anota cada blit del frame"""
+    def __init__(self, superficie, fondo):
+        self.superficie = superficie
+        self.fondo = fondo
+        # (rect, id de la imagen) -> (rect, imagen); se guarda la imagen para que su id no se reutilice
+        self.previos = None
+        self.actuales = {}
+
+    def get_width(self):
+        return self.superficie.get_width()
+
+    def get_height(self):
+        return self.superficie.get_height()
+
+    def blit(self, img, pos, area=None):
+        rect = self.superficie.blit(img, pos, area)
+        self.actuales[(tuple(rect), id(img))] = (rect, img)
+        return rect
+
+    def comenzar(self):
+        """Restaura el fondo debajo de todo lo que se dibujó en el frame anterior"""
+        if self.previos is None:
+            self.superficie.blit(self.fondo, (0, 0))
+            return
+        for rect, _ in self.previos.values():
+            self.superficie.blit(self.fondo, rect, rect)
+
+    def terminar(self):
+        """Envía a la pantalla solo lo que cambió y devuelve la lista de regiones"""
+        if self.previos is None:
+            pygame.display.flip()
+            cambiados = [self.superficie.get_rect()]
+        else:
+            cambiados = [r for clave, (r, _) in self.previos.items() if clave not in self.actuales]
+            cambiados += [r for clave, (r, _) in self.actuales.items() if clave not in self.previos]
+            if cambiados:
+                pygame.display.update(cambiados)
+        self.previos = self.actuales
+        self.actuales = {}
+        return cambiados
+
+    def invalidar(self):
+        """Fuerza un redibujado completo en el próximo frame"""
+        self.previos = None
@@ -0,0 +1,123 @@
+# Grabación y repetición determinista de partidas de Prueba.Juego.
+# Con la semilla del generador aleatorio y la entrada de cada frame se puede
+# volver a jugar la partida exacta sin ventana y sin esperar al reloj. Al
+# final se compara un hash del estado para detectar cualquier diferencia.
+#
+# Formato del archivo (.rep):
+#   "MREP" | versión (B) | opciones (B) | semilla (q) | frames (I) | hash sha1 (20 bytes) | frames comprimidos con zlib
+# Opciones: bit 0 = la partida usó el almacén de entidades (numpy).
+# Cada frame es un byte: bit 0 = izquierda, bit 1 = derecha, bit 2 = salto.
+import hashlib
+import os
+import struct
+import sys
+import time
+import zlib
+
+MAGIA = b"MREP"
+VERSION_REPETICION = 1
+CABECERA = struct.Struct("<4sBBqI20s")
+OPCION_ALMACEN = 1
+
+IZQUIERDA = 1
+DERECHA = 2
+SALTO = 4
+
+
+def codificar(izquierda, derecha, salto):
+    return (IZQUIERDA if izquierda else 0) | (DERECHA if derecha else 0) | (SALTO if salto else 0)
+
+
+def decodificar(valor):
+    return bool(valor & IZQUIERDA), bool(valor & DERECHA), bool(valor & SALTO)
+
+
+class GrabadorEntrada:
+    """Envuelve otra entrada y guarda lo que devuelve en cada frame"""
+    def __init__(self, entrada):
+        self.entrada = entrada
+        self.frames = bytearray()
+
+    def leer(self):
+        izquierda, derecha, salto = self.entrada.leer()
+        self.frames.append(codificar(izquierda, derecha, salto))
+        return izquierda, derecha, salto
+
+
+class EntradaGrabada:
+    """Devuelve la entrada de una grabación, un frame por llamada"""
+    def __init__(self, frames):
+        self.frames = bytes(frames)
+        self.indice = 0
+
+    def leer(self):
+        if self.indice >= len(self.frames):
+            return False, False, False
+        valor = self.frames[self.indice]
+        self.indice += 1
+        return decodificar(valor)
+
+
+def suma_estado(juego):
+    """Hash del estado lógico de la partida (no incluye nada de la pantalla ni del audio)"""
+    j = juego.jugador
+    partes = [
+        (j.x, j.y, j.alto, j.estado, j.vidas, j.salto, j.contador_salto,
+         j.inmunidad, j.tiempo_inmunidad, j.recogidas_monedas),
+        (juego.enemigos_creados_total, juego.tiempo_desde_ultimo_enemigo, juego.juego_terminado),
+        [(h.activo, h.tiempo_visible) for h in (juego.hongo_crecimiento, juego.hongo_vida)],
+        juego.estrella.activo,
+    ]
+    if juego.usar_almacen:
+        for almacen in (juego.almacen_enemigos, juego.almacen_monedas):
+            partes.append([getattr(almacen, c)[:almacen.n].tobytes() for c in almacen._COLUMNAS])
+    else:
+        partes.append([(g.tipo, g.x, g.activo) for g in juego.goombas])
+        partes.append([(t.x, t.y, t.estado, t.direccion, t.activo) for t in juego.tortugas])
+        partes.append([(m.x, m.y, m.activo) for m in juego.monedas])
+    return hashlib.sha1(repr(partes).encode()).digest()
+
+
+def guardar_grabacion(ruta, semilla, frames, suma, usar_almacen=False):
+    opciones = OPCION_ALMACEN if usar_almacen else 0
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as f:
+        f.write(CABECERA.pack(MAGIA, VERSION_REPETICION, opciones, semilla, len(frames), suma))
+        f.write(zlib.compress(bytes(frames), 9))
+    os.replace(temporal, ruta)
+
+
+def cargar_grabacion(ruta):
+    """Devuelve (semilla, frames, hash, usar_almacen)"""
+    with open(ruta, "rb") as f:
+        contenido = f.read()
+    magia, version, opciones, semilla, total, suma = CABECERA.unpack_from(contenido, 0)
+    if magia != MAGIA or version != VERSION_REPETICION:
+        raise ValueError(f"{ruta} no es una grabación válida")
+    frames = zlib.decompress(contenido[CABECERA.size:])
+    if len(frames) != total:
+        raise ValueError(f"{ruta}: se esperaban {total} frames y hay {len(frames)}")
+    return semilla, frames, suma, bool(opciones & OPCION_ALMACEN)
+
+
+def reproducir(ruta):
+    """Repite la partida lo más rápido posible. Devuelve (coincide, frames, segundos)."""
+    from Prueba import Juego
+    semilla, frames, suma, usar_almacen = cargar_grabacion(ruta)
+    juego = Juego(headless=True, entrada=EntradaGrabada(frames), semilla=semilla,
+                  usar_almacen=usar_almacen)
+    inicio = time.perf_counter()
+    for _ in range(len(frames)):
+        juego.aplicar_entrada()
+        juego.actualizar()
+    duracion = time.perf_counter() - inicio
+    return suma_estado(juego) == suma, len(frames), duracion
+
+
+if __name__ == "__main__":
+    # Uso: python Repeticion.py partida.rep
+    os.environ["MARIO_HEADLESS"] = "1"
+    coincide, total, duracion = reproducir(sys.argv[1])
+    print(f"Frames repetidos: {total} en {duracion:.2f} s ({total / max(duracion, 1e-9):.0f} frames/s)")
+    print("✅ El estado final coincide con la grabación" if coincide else "❌ El estado final NO coincide")
+    sys.exit(0 if coincide else 1)
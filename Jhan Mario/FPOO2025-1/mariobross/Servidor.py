@@ -0,0 +1,238 @@
+# Servidor autoritativo del juego Tk para varios jugadores (asyncio, TCP).
+# Cada sala corre la simulación de Game.py (reglas en Reglas.py) para todos sus
+# jugadores y en cada tick envía solo lo que cambió (ver Protocolo.py). Los
+# jugadores que no se movieron no cuestan nada: solo se comparan los marcados
+# como sucios, y un tick sin cambios no envía ningún byte. Un cliente lento
+# deja de recibir deltas y se vuelve a sincronizar con una instantánea completa
+# cuando vacía su búfer.
+#
+# Uso: python Servidor.py [puerto]
+import asyncio
+import random
+import sys
+
+import Protocolo
+import Registro
+import Reglas
+from Objetos import Recogible, IndiceRecogibles
+from Personaje import Jugador
+
+registro = Registro.obtener("red")
+
+PUERTO = 8765
+MAX_BUFER = 64 * 1024  # bytes pendientes por cliente antes de pausar sus deltas
+
+
+class EstadoJugador:
+    __slots__ = ("dx", "jump_step", "img_key", "idle_key", "img_ticks")
+
+    def __init__(self):
+        self.dx = 0
+        self.jump_step = 0
+        self.img_key = "inicial"
+        self.idle_key = "inicial"
+        self.img_ticks = 0
+
+
+class Sala:
+    def __init__(self, nombre, rng=random):
+        self.nombre = nombre
+        self.tick = 0
+        self.jugadores = {}   # id -> Jugador
+        self.estados = {}     # id -> EstadoJugador
+        self.enviados = {}    # id -> valores del último tick enviado
+        self.sucios = set()
+        self.salidos = []
+        self.siguiente_id = 1
+        self.clientes = {}    # escritor -> necesita instantánea completa
+        self.bytes_enviados = 0
+
+        self.recogibles = {}  # id -> Recogible
+        self.ids_recogible = {}
+        self.siguiente_recogible = 1
+        self.indice = IndiceRecogibles()
+        self.recogibles_nuevos = []
+        self.recogibles_quitados = []
+        self.efectos = {"hongoRojo": self.crecer_personaje, "hongoVerde": self.vida_extra}
+        for tipo in ("hongoRojo", "hongoVerde"):
+            self.agregar_recogible(tipo, rng.randint(0, Reglas.ANCHO - 40), Reglas.ALTO // 2)
+
+    # --- Simulación ---------------------------------------------------------
+
+    def agregar_jugador(self):
+        jid = self.siguiente_id
+        self.siguiente_id += 1
+        self.jugadores[jid] = Jugador(jid, f"Jugador{jid}", Reglas.ANCHO // 2, Reglas.ALTO // 2)
+        self.estados[jid] = EstadoJugador()
+        self.sucios.add(jid)
+        return jid
+
+    def quitar_jugador(self, jid):
+        del self.jugadores[jid]
+        del self.estados[jid]
+        self.sucios.discard(jid)
+        if self.enviados.pop(jid, None) is not None:
+            self.salidos.append(jid)
+
+    def agregar_recogible(self, tipo, x, y):
+        rid = self.siguiente_recogible
+        self.siguiente_recogible += 1
+        obj = Recogible(tipo, x, y)
+        self.recogibles[rid] = obj
+        self.ids_recogible[obj] = rid
+        self.indice.agregar(obj)
+        self.recogibles_nuevos.append(rid)
+
+    def tecla(self, jid, tecla):
+        Reglas.aplicar_tecla(self.estados[jid], tecla)
+        self.sucios.add(jid)
+
+    def avanzar(self):
+        """Un tick de Game.tick para los jugadores con algo pendiente"""
+        self.tick += 1
+        for jid in list(self.sucios):
+            st = self.estados[jid]
+            if not (st.dx or st.jump_step or st.img_ticks):
+                continue
+            dx, dy = Reglas.avanzar(st)
+            if dx or dy:
+                p = self.jugadores[jid]
+                p.mover(dx=dx, dy=dy)
+                self.recoger(p)
+            # Sigue sucio mientras salta o anima; se limpia al armar el delta si no cambió nada
+
+    def recoger(self, p):
+        for obj in self.indice.cercanos(p.posicionX, p.posicionY, Reglas.PICKUP_RADIO):
+            self.indice.quitar(obj)
+            rid = self.ids_recogible.pop(obj)
+            del self.recogibles[rid]
+            if rid in self.recogibles_nuevos:
+                self.recogibles_nuevos.remove(rid)
+            else:
+                self.recogibles_quitados.append(rid)
+            self.efectos[obj.tipo](p)
+
+    def crecer_personaje(self, p):
+        p.tamano = "grande"
+
+    def vida_extra(self, p):
+        p.vidas += 1
+
+    def valores(self, jid):
+        p = self.jugadores[jid]
+        st = self.estados[jid]
+        return (p.posicionX, p.posicionY, p.vidas, p.monedas, p.puntos, p.tiempo,
+                int(p.tamano == "grande"), Reglas.SPRITES_JUGADOR.index(st.img_key))
+
+    # --- Instantáneas ---------------------------------------------------------
+
+    def delta(self):
+        """Cambios desde el tick anterior (None si no cambió nada)"""
+        cambiados = []
+        for jid in self.sucios:
+            actual = self.valores(jid)
+            m = Protocolo.mascara(self.enviados.get(jid), actual)
+            if m:
+                cambiados.append((jid, m, actual))
+                self.enviados[jid] = actual
+        # Los que ya no tienen nada pendiente dejan de revisarse
+        self.sucios = {jid for jid in self.sucios
+                       if self.estados[jid].dx or self.estados[jid].jump_step or self.estados[jid].img_ticks}
+        if not (cambiados or self.salidos or self.recogibles_nuevos or self.recogibles_quitados):
+            return None
+        nuevos = [(rid, self.recogibles[rid].tipo, self.recogibles[rid].posicionX, self.recogibles[rid].posicionY)
+                  for rid in self.recogibles_nuevos]
+        datos = Protocolo.codificar_instantanea(self.tick, 0, cambiados, self.salidos, nuevos,
+                                                self.recogibles_quitados)
+        self.salidos = []
+        self.recogibles_nuevos = []
+        self.recogibles_quitados = []
+        return Protocolo.enmarcar(datos)
+
+    def completa(self):
+        jugadores = [(jid, Protocolo.TODOS, self.enviados[jid]) for jid in self.jugadores if jid in self.enviados]
+        recogibles = [(rid, o.tipo, o.posicionX, o.posicionY) for rid, o in self.recogibles.items()]
+        return Protocolo.enmarcar(Protocolo.codificar_instantanea(self.tick, 1, jugadores, [], recogibles, []))
+
+    def difundir(self):
+        """Arma el delta una vez y lo envía a todos; los que lo necesitan reciben la instantánea completa"""
+        delta = self.delta()
+        completa = None
+        for escritor, necesita_completa in self.clientes.items():
+            if escritor.transport.get_write_buffer_size() > MAX_BUFER:
+                self.clientes[escritor] = True  # cliente lento: se resincroniza después
+                continue
+            if necesita_completa:
+                completa = completa or self.completa()
+                escritor.write(completa)
+                self.bytes_enviados += len(completa)
+                self.clientes[escritor] = False
+            elif delta:
+                escritor.write(delta)
+                self.bytes_enviados += len(delta)
+
+    async def correr(self):
+        reloj = asyncio.get_running_loop().time
+        siguiente = reloj()
+        while self.clientes:
+            self.avanzar()
+            self.difundir()
+            siguiente += Reglas.TICK_MS / 1000
+            await asyncio.sleep(max(0.0, siguiente - reloj()))
+        registro.info("Sala %s cerrada tras %d ticks (%d bytes enviados)", self.nombre, self.tick, self.bytes_enviados)
+
+
+class Servidor:
+    def __init__(self):
+        self.salas = {}
+
+    async def atender(self, lector, escritor):
+        mensaje = await Protocolo.leer_mensaje(lector)
+        if mensaje[:1] != b"J":
+            escritor.close()
+            return
+        nombre = mensaje[1:].decode("utf-8") or "principal"
+        sala = self.salas.get(nombre)
+        nueva = sala is None
+        if nueva:
+            sala = self.salas[nombre] = Sala(nombre)
+        jid = sala.agregar_jugador()
+        escritor.write(Protocolo.enmarcar(Protocolo.HOLA.pack(b"H", jid)))
+        sala.clientes[escritor] = True
+        if nueva:
+            asyncio.get_running_loop().create_task(self.correr_sala(sala))
+        registro.info("Jugador %d entró a la sala %s (%d jugadores)", jid, nombre, len(sala.jugadores))
+        try:
+            while True:
+                mensaje = await Protocolo.leer_mensaje(lector)
+                if mensaje[:1] == b"K" and len(mensaje) == 2 and mensaje[1] < len(Reglas.TECLAS):
+                    sala.tecla(jid, Reglas.TECLAS[mensaje[1]])
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            sala.clientes.pop(escritor, None)
+            sala.quitar_jugador(jid)
+            escritor.close()
+            registro.info("Jugador %d salió de la sala %s", jid, nombre)
+
+    async def correr_sala(self, sala):
+        try:
+            await sala.correr()
+        finally:
+            if self.salas.get(sala.nombre) is sala:
+                del self.salas[sala.nombre]
+
+    async def iniciar(self, host="127.0.0.1", puerto=PUERTO):
+        servidor = await asyncio.start_server(self.atender, host, puerto)
+        registro.info("Servidor escuchando en %s:%d", host, puerto)
+        async with servidor:
+            await servidor.serve_forever()
+
+
+if __name__ == "__main__":
+    Registro.configurar()
+    puerto = int(sys.argv[1]) if len(sys.argv) > 1 else PUERTO
+    try:
+        asyncio.run(Servidor().iniciar(puerto=puerto))
+    except KeyboardInterrupt:
+        pass
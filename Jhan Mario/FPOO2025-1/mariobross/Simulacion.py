@@ -0,0 +1,50 @@
+# Simulación sin ventana de la lógica de Prueba.Juego (pruebas de resistencia y balance)
+import os
+import sys
+import time
+import random
+
+os.environ["MARIO_HEADLESS"] = "1"
+
+from Prueba import Juego, EntradaScript
+
+
+def guion_aleatorio(frames, semilla=0):
+    """Genera una entrada aleatoria que mantiene cada acción unos cuantos frames"""
+    rng = random.Random(semilla)
+    guion = []
+    while len(guion) < frames:
+        accion = (rng.random() < 0.3, rng.random() < 0.6, rng.random() < 0.2)
+        guion.extend([accion] * rng.randint(5, 30))
+    return guion[:frames]
+
+
+def simular(frames=100000, semilla=0, usar_almacen=False, max_enemigos=None):
+    # La misma semilla fija el guion y el azar del juego: la corrida se puede repetir
+    juego = Juego(headless=True, entrada=EntradaScript(guion_aleatorio(frames, semilla)),
+                  semilla=semilla, usar_almacen=usar_almacen)
+    if max_enemigos:
+        # Nivel de estrés: muchos enemigos a la vez y aparición continua
+        juego.max_enemigos_simultaneos = max_enemigos
+        juego.max_enemigos_total = float("inf")
+        juego.tiempo_minimo_entre_enemigos = 0
+    inicio = time.perf_counter()
+    ejecutados = juego.simular(frames)
+    duracion = time.perf_counter() - inicio
+    return juego, ejecutados, duracion
+
+
+if __name__ == "__main__":
+    # Uso: python Simulacion.py [frames] [semilla] [--almacen] [--estres=N]
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    opciones = [a for a in sys.argv[1:] if a.startswith("--")]
+    frames = int(args[0]) if len(args) > 0 else 100000
+    semilla = int(args[1]) if len(args) > 1 else 0
+    usar_almacen = "--almacen" in opciones
+    max_enemigos = next((int(o.split("=")[1]) for o in opciones if o.startswith("--estres=")), None)
+    juego, ejecutados, duracion = simular(frames, semilla, usar_almacen, max_enemigos)
+    print(f"Frames simulados: {ejecutados} en {duracion:.2f} s ({ejecutados / duracion:.0f} frames/s)")
+    print(f"Vidas: {juego.jugador.vidas}  Monedas: {juego.jugador.recogidas_monedas}  "
+          f"Enemigos creados: {juego.enemigos_creados_total}  Terminado: {juego.juego_terminado}")
+    if not juego.usar_almacen:
+        print(f"Colisiones del último frame: {juego.estadisticas_colision()}")